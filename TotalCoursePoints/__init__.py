@@ -4,6 +4,11 @@ from .student import Student
 from .category import Category, StudentCategoryData
 from .assignment import Assignment, StudentAssignmentData
 from .group import Group
+from .score_matrix import ScoreMatrix
+from .cache import ParsedDataCache, GSheetCache
+from .summary import ClassSummary
+from .curve import CurveSearch
+from .instrumentation import Instrumentation
 # from .gs_api_client import GradescopeAPIClient
 
 __all__ = [
@@ -16,5 +21,11 @@ __all__ = [
     "Assignment",
     "StudentAssignmentData",
     "Group",
-    "PNP"
+    "PNP",
+    "ScoreMatrix",
+    "ParsedDataCache",
+    "GSheetCache",
+    "ClassSummary",
+    "CurveSearch",
+    "Instrumentation"
 ]
\ No newline at end of file
@@ -3,11 +3,15 @@ This stores the assignment data.
 """
 
 from __future__ import annotations
+from collections import Counter
+from itertools import compress
 from math import ceil
 import numpy
 import csv
+from operator import attrgetter
 from typing import Callable
 from .utils import GSheetBase, safe_cast, GracePeriod, Time
+from . import instrumentation
 
 SID_MARKER = "SID"
 NAME_MARKER = "Name"
@@ -18,10 +22,135 @@ STATUS_MARKER = "Status"
 
 STATUS_IS_GRADED = "Graded"
 
+DROPPED_COMMENT = "This assignment has been dropped."
+
+class AssignmentColumns:
+    """
+    The typed columns of a Gradescope export (one entry per row).
+    late_seconds already has the grace period applied and has_lateness is False
+    for rows which did not have a lateness value.
+    """
+    def __init__(self, sid: numpy.ndarray, email: numpy.ndarray, name: numpy.ndarray, score: numpy.ndarray, late_seconds: numpy.ndarray, has_lateness: numpy.ndarray, graded: numpy.ndarray):
+        self.sid = sid
+        self.email = email
+        self.name = name
+        self.score = score
+        self.late_seconds = late_seconds
+        self.has_lateness = has_lateness
+        self.graded = graded
+        self.row_data = [None] * len(score)
+        self.sid_rows = None
+        self.email_rows = None
+
+    def __len__(self):
+        return len(self.score)
+
+    def build_index(self):
+        """Indexes the rows by SID and email (see :func:`index_rows`), the rows are popped as they are looked up."""
+        self.sid_rows = index_rows(self.sid.tolist())
+        if self.email is None:
+            self.email_rows = {None: list(range(len(self)))} if len(self) > 0 else {}
+        else:
+            self.email_rows = index_rows(self.email.tolist())
+
+    def get_row_data(self, row: int, assignment: Assignment) -> StudentAssignmentData:
+        """Returns the StudentAssignmentData of the row, creating it the first time it is needed."""
+        sad = self.row_data[row]
+        if sad is None:
+            time_late = Time.from_seconds(int(self.late_seconds[row])) if self.has_lateness[row] else 0
+            name = None if self.name is None else str(self.name[row])
+            email = None if self.email is None else str(self.email[row])
+            sad = StudentAssignmentData(float(self.score[row]), time_late, name, str(self.sid[row]), email, assignment)
+            self.row_data[row] = sad
+        return sad
+
+def index_rows(keys: list) -> dict:
+    """Maps every key to its row, or to the list of its rows (in order) when it is repeated."""
+    index = {key: row for row, key in enumerate(keys)}
+    if len(index) < len(keys):
+        repeated = {key for key, count in Counter(keys).items() if count > 1}
+        for key in repeated:
+            index[key] = []
+        for row in [row for row, key in enumerate(keys) if key in repeated]:
+            index[keys[row]].append(row)
+    return index
+
+def parse_float_column(values: tuple) -> numpy.ndarray:
+    """Casts the cells like safe_cast followed by `0 if not score`: the empty and invalid cells are 0."""
+    try:
+        score = numpy.fromiter(map(float, [value or "0" for value in values]), dtype=float, count=len(values))
+        # Adding 0.0 turns -0.0 into 0.0 like `0 if not score`.
+        return score + 0.0
+    except ValueError:
+        # Only files with non numeric cells take the per cell path.
+        return numpy.array([safe_cast(value, float) or 0 for value in values], dtype=float)
+
+def parse_gradescope_csv(data_file: str, grace_period: GracePeriod=None) -> AssignmentColumns:
+    """
+    Parses a Gradescope export straight into typed columns. This is the bulk version of
+    :meth:`Assignment.load_data`: the rows are transposed once and every column is cast,
+    the lateness parsed and the grace period applied on whole arrays.
+    """
+    with open(data_file) as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, [])
+        rows = list(reader)
+    width = len(header)
+    if rows and min(map(len, rows)) < width:
+        rows = [row + [""] * (width - len(row)) if len(row) < width else row for row in rows]
+    cells = list(zip(*rows)) if rows else [()] * width
+    col = {key: i for i, key in enumerate(header)}
+    def column(marker):
+        i = col.get(marker)
+        if i is None:
+            return None
+        return cells[i]
+
+    scores = column(SCORE_MARKER)
+    score = numpy.zeros(len(rows)) if scores is None else parse_float_column(scores)
+    sids = column(SID_MARKER)
+    sid = numpy.array(sids if sids is not None else ["None"] * len(rows), dtype=str)
+    emails = column(EMAIL_MARKER)
+    email = None if emails is None else numpy.array(emails, dtype=str)
+    names = column(NAME_MARKER)
+    name = None if names is None else numpy.array(names, dtype=str)
+    statuses = column(STATUS_MARKER)
+    graded = numpy.zeros(len(rows), dtype=bool) if statuses is None else numpy.array(statuses, dtype=str) == STATUS_IS_GRADED
+
+    late_seconds = numpy.zeros(len(rows), dtype=numpy.int64)
+    lateness = column(DAYS_LATE_MAKER)
+    has_lateness = numpy.zeros(len(rows), dtype=bool)
+    if lateness is not None:
+        lateness = numpy.array(lateness, dtype=str)
+        has_lateness = lateness != ""
+        present = lateness[has_lateness]
+        if len(present) > 0:
+            invalid = numpy.char.count(present, ":") != 2
+            if invalid.any():
+                print(f"Invalid lateness: {present[invalid][0]}")
+                raise ValueError(f"Invalid lateness column!")
+            hms = numpy.array(" ".join(present).replace(":", " ").split(), dtype=numpy.int64)
+            if len(hms) != 3 * len(present):
+                raise ValueError(f"Invalid lateness value in {data_file}!")
+            late = hms.reshape(-1, 3) @ numpy.array([3600, 60, 1], dtype=numpy.int64)
+            if isinstance(grace_period, GracePeriod):
+                if grace_period.apply_to_all_late_time:
+                    raise NotImplementedError()
+                late = numpy.where(late <= grace_period.time.get_seconds(), 0, late)
+            late_seconds[has_lateness] = late
+    return AssignmentColumns(sid, email, name, score, late_seconds, has_lateness, graded)
+
 class Assignment:
     default_gsheet_id = None
     default_gsheet_base = None
     use_gsheet_grades = None
+    # Loads csv files into typed columns and only creates the student data when it is needed.
+    bulk_load = False
+    # A ParsedDataCache for the bulk path, the files are only parsed when they are not cached.
+    parsed_data_cache = None
+    policy_cache = None
+    # The AssignmentSummary of the class summary (see Classroom.set_class_summary), its scores and stats are used instead of this assignment's.
+    score_summary = None
     def __init__(self, 
         id: str,
         category, 
@@ -118,8 +247,10 @@ class Assignment:
         self.hidden = hidden or category.hidden
         self.data = {}
         self.edata = {}
+        self.pending_columns = []
         self.scores = []
         self.all_scores = []
+        self.invalidate_scores_cache()
         self.data_loaded = False
         self.additional_points = additional_points
         self.gsheets_grades = gsheets_grades
@@ -129,31 +260,38 @@ class Assignment:
             self.load()
         print(init_str_done)
 
-    def load(self):
+    def load(self, bulk: bool=None):
+        """Loads the data file (or the gsheet if it fails), bulk overrides :attr:`bulk_load` for the data file."""
         tmp = f": {self.name}" if self.name is not None else ""
         load_str = f"Loading assignment {self.id}{tmp}..."
         load_str_done = load_str + "Done!"
         print(load_str)
-        try:
-            self.load_file()
-            self.data_loaded = True
-        except Exception as exc:
-            def check_error_type(e):
-                if isinstance(e, ValueError) and str(e) == "Invalid lateness column!":
-                    raise e from None
-            check_error_type(exc)
-            if self.gsheets_grades is not None and self.gsheets_grades or self.gsheets_grades is None and self.use_gsheet_grades:
-                try:
-                    self.load_gsheet(self.gsheets_grades)
-                except Exception as e:
-                    check_error_type(e)
-                    print(f"Failed to load grades from gsheet for {self.id}")
+        with instrumentation.span("load_assignment", category=self.category.name, id=self.id):
+            try:
+                self.load_file(bulk=bulk)
+                self.data_loaded = True
+            except Exception as exc:
+                def check_error_type(e):
+                    if isinstance(e, ValueError) and str(e) == "Invalid lateness column!":
+                        raise e from None
+                check_error_type(exc)
+                if self.gsheets_grades is not None and self.gsheets_grades or self.gsheets_grades is None and self.use_gsheet_grades:
+                    try:
+                        self.load_gsheet(self.gsheets_grades)
+                    except Exception as e:
+                        check_error_type(e)
+                        print(f"Failed to load grades from gsheet for {self.id}")
+                        self.data_loaded = False
+                else:
                     self.data_loaded = False
-            else:
-                self.data_loaded = False
-                print("Failed to load file {}.".format(self.data_file))
+                    print("Failed to load file {}.".format(self.data_file))
+        self.invalidate_cache()
         print(load_str_done)
 
+    def invalidate_cache(self):
+        """Clears the cached values which depend on this assignment. Call this if you modify the assignment directly."""
+        self.category.invalidate_cache()
+
     def load_gsheet(self, gsheet, data_sheet: str=None):
         if data_sheet is None:
             data_sheet = self.data_sheet
@@ -168,14 +306,116 @@ class Assignment:
         except Exception as e:
             import traceback
             traceback.print_exc()
+        self.invalidate_cache()
 
-    def load_file(self, data_file: str=None):
+    def load_file(self, data_file: str=None, bulk: bool=None):
         if data_file is None:
             data_file = self.data_file
+        if bulk is None:
+            bulk = self.bulk_load
+        if bulk or self.parsed_data_cache is not None:
+            if self.parsed_data_cache is not None:
+                columns = self.parsed_data_cache.load(data_file, self.grace_period)
+            else:
+                columns = parse_gradescope_csv(data_file, self.grace_period)
+            self.load_columns(columns)
+            return
 
         with open(data_file) as csvfile:
             reader = csv.DictReader(csvfile)
             self.load_data(reader)
+
+    def get_policy(self) -> AssignmentPolicy:
+        """Returns the shared policy of this assignment, a new one is only created when the policy changed."""
+        values = (
+            self.give_perfect_score,
+            self.no_late_time,
+            self.blanket_late_penalty,
+            self.late_penalty,
+            self.max_late_time,
+            self.additional_points,
+            self.out_of,
+            self.extra_credit,
+            self.category.max_slip_count,
+            self.does_not_contribute,
+        )
+        policy = self.policy_cache
+        if policy is None or policy.values != values:
+            policy = AssignmentPolicy(self, values)
+            self.policy_cache = policy
+        return policy
+
+    def reset_data(self):
+        """Removes all of the loaded data so the assignment can be loaded again."""
+        self.data = {}
+        self.edata = {}
+        self.pending_columns = []
+        self.scores = []
+        self.all_scores = []
+        self.data_loaded = False
+        self.invalidate_scores_cache()
+
+    def load_columns(self, columns: AssignmentColumns):
+        """
+        Loads parsed columns (see :func:`parse_gradescope_csv`). The scores are available right away
+        but each row's StudentAssignmentData is only created when its student is looked up.
+        """
+        scores = [score if score else 0 for score in columns.score.tolist()]
+        self.all_scores.extend(scores)
+        self.scores.extend(compress(scores, columns.graded.tolist()))
+        columns.build_index()
+        self.pending_columns.append(columns)
+        self.invalidate_scores_cache()
+
+    def get_sid_data(self, sid: str):
+        for columns in self.pending_columns:
+            rows = columns.sid_rows.pop(sid, None)
+            if rows is not None:
+                for row in (rows if isinstance(rows, list) else (rows,)):
+                    self.insert_sid_data(sid, columns.get_row_data(row, self))
+        return self.data.get(sid)
+
+    def get_email_data(self, email: str):
+        for columns in self.pending_columns:
+            rows = columns.email_rows.pop(email, None)
+            if rows is not None:
+                for row in (rows if isinstance(rows, list) else (rows,)):
+                    self.insert_email_data(email, columns.get_row_data(row, self))
+        return self.edata.get(email)
+
+    def materialize_data(self):
+        """Creates the StudentAssignmentData of every bulk loaded row so self.data and self.edata are complete."""
+        for columns in self.pending_columns:
+            for sid in list(columns.sid_rows.keys()):
+                self.get_sid_data(sid)
+            for email in list(columns.email_rows.keys()):
+                self.get_email_data(email)
+
+    def insert_sid_data(self, sid: str, sad: StudentAssignmentData):
+        dat = self.data.get(sid)
+        if dat is None:
+            self.data[sid] = sad
+        else:
+            if isinstance(dat, list):
+                dat.append(sad)
+            else:
+                self.data[sid] = [dat, sad]
+        if sid in self.data:
+            if isinstance(self.data[sid], list):
+                self.data[sid].append(sad)
+
+    def insert_email_data(self, email: str, sad: StudentAssignmentData):
+        edat = self.edata.get(email)
+        if edat is None:
+            self.edata[email] = sad
+        else:
+            if isinstance(email, list):
+                edat.append(sad)
+            else:
+                self.edata[email] = [edat, sad]
+        if email in self.edata:
+            if isinstance(self.edata[email], list):
+                self.edata[email].append(sad)
     
     def load_data(self, data):
         for row in data:
@@ -217,29 +457,9 @@ class Assignment:
                 is_graded = row.get(STATUS_MARKER) == STATUS_IS_GRADED
                 if is_graded:
                     self.scores.append(sad.score)
-                dat = self.data.get(sid)
-                if dat is None:
-                    self.data[sid] = sad
-                else:
-                    if isinstance(dat, list):
-                        dat.append(sad)
-                    else:
-                        self.data[sid] = [dat, sad]
-                if sid in self.data:
-                    if isinstance(self.data[sid], list):
-                        self.data[sid].append(sad)
-
-                edat = self.edata.get(email)
-                if edat is None:
-                    self.edata[email] = sad
-                else:
-                    if isinstance(email, list):
-                        edat.append(sad)
-                    else:
-                        self.edata[email] = [edat, sad]
-                if email in self.edata:
-                    if isinstance(self.edata[email], list):
-                        self.edata[email].append(sad)
+                self.insert_sid_data(sid, sad)
+                self.insert_email_data(email, sad)
+        self.invalidate_scores_cache()
 
     def get_student_data(self, student: Student) -> StudentAssignmentData:
         if not self.data_loaded:
@@ -252,9 +472,9 @@ class Assignment:
                 self,
                 data_loaded=False
             )
-        dat = self.data.get(student.sid)
+        dat = self.get_sid_data(student.sid)
         if dat is None:
-            dat = self.edata.get(student.email)
+            dat = self.get_email_data(student.email)
         if isinstance(dat, list):
             for item in dat:
                 if item.email == student.email:
@@ -282,27 +502,85 @@ class Assignment:
             return self.course_points
         else:
             if self.percentage is True:
-                return self.category.course_points / (sum([1 for a in self.category.assignments if a.percentage is True]) - self.category.drop_lowest_n_assignments)
+                return self.category.course_points / (self.category.get_percentage_assignments_count() - self.category.drop_lowest_n_assignments)
             return self.category.course_points * self.percentage
 
+    def get_course_points_many(self, scores, late_seconds=None, extension_seconds=None, slip_counts=None, dropped=None, with_additional_points: bool=True, convert_to_course_points=True) -> numpy.ndarray:
+        """
+        Vectorized version of :meth:`StudentAssignmentData.get_course_points` which
+        evaluates the late penalty for every student of this assignment at once.
+
+        All arguments are array likes of the same length (one entry per student).
+        Late and extension times are given in seconds and slip counts in late intervals.
+        """
+        scores = numpy.asarray(scores, dtype=float)
+        n = len(scores)
+        if self.give_perfect_score:
+            return numpy.full(n, self.get_total_possible(), dtype=float)
+        if self.no_late_time or late_seconds is None:
+            num_late = numpy.zeros(n)
+        else:
+            interval = self.late_interval.get_seconds()
+            late = numpy.asarray(late_seconds, dtype=float)
+            if extension_seconds is not None:
+                late = late - numpy.asarray(extension_seconds, dtype=float)
+            late = numpy.maximum(0, late)
+            if slip_counts is not None:
+                late = numpy.maximum(0, late - numpy.asarray(slip_counts) * interval)
+            num_late = -(-late // interval)
+        if self.blanket_late_penalty:
+            num_late = numpy.where(num_late > 0, 1, 0)
+        penalty = 1 - numpy.minimum(num_late * self.late_penalty, 1)
+        if self.max_late_time is not None:
+            penalty = numpy.where(num_late <= self.max_late_time, penalty, 0)
+        score = scores + (self.additional_points if with_additional_points else 0)
+        if convert_to_course_points:
+            score *= (self.get_total_possible() / self.out_of)
+        points = penalty * score
+        if dropped is not None:
+            points = numpy.where(dropped, 0, points)
+        return points
+
+    def invalidate_scores_cache(self):
+        """Clears the sorted scores and stats. This must be called whenever self.scores or self.all_scores change."""
+        self.sorted_scores = {}
+        self.stats = {}
+
+    def get_sorted_scores(self, use_all_scores: bool=False) -> numpy.ndarray:
+        if self.score_summary is not None and not use_all_scores:
+            return self.score_summary.sorted_scores
+        sorted_scores = self.sorted_scores.get(use_all_scores)
+        if sorted_scores is None:
+            scores = self.all_scores if use_all_scores else self.scores
+            sorted_scores = numpy.sort(numpy.array(scores, dtype=float))
+            self.sorted_scores[use_all_scores] = sorted_scores
+        return sorted_scores
+
     def get_rank(self, score: float, use_all_scores: bool=False) -> tuple:
-        scores = self.all_scores if use_all_scores else self.scores
-        rank = 1
-        for s in scores:
-            if s > score:
-                rank += 1
-        return rank
+        scores = self.get_sorted_scores(use_all_scores=use_all_scores)
+        # The rank is one more than the number of scores which are strictly greater.
+        return 1 + len(scores) - int(numpy.searchsorted(scores, score, side="right"))
+
+    def get_score_count(self, use_all_scores: bool=False) -> int:
+        """Returns the number of scores the ranks are out of."""
+        if self.score_summary is not None and not use_all_scores:
+            return len(self.score_summary.sorted_scores)
+        return len(self.all_scores if use_all_scores else self.scores)
     
     def get_stats(self, use_all_scores: bool=False) -> tuple:
-        scores = self.all_scores if use_all_scores else self.scores
-        if len(scores) == 0:
-            return 0, 0, 0, 0, 0
-        self.mean = numpy.mean(scores)
-        self.median = numpy.median(scores)
-        self.std = numpy.std(scores)
-        self.max = max(scores)
-        self.min = min(scores)
-        return (self.mean, self.median, self.std, self.max, self.min)
+        if self.score_summary is not None and not use_all_scores:
+            stats = self.score_summary.stats
+            self.mean, self.median, self.std, self.max, self.min = stats
+            return stats
+        stats = self.stats.get(use_all_scores)
+        if stats is None:
+            scores = self.all_scores if use_all_scores else self.scores
+            if len(scores) == 0:
+                return 0, 0, 0, 0, 0
+            stats = (numpy.mean(scores), numpy.median(scores), numpy.std(scores), max(scores), min(scores))
+            self.stats[use_all_scores] = stats
+        self.mean, self.median, self.std, self.max, self.min = stats
+        return stats
     
     def get_stats_str(self) -> str:
         if not self.data_loaded:
@@ -319,6 +597,7 @@ class Assignment:
                 continue
             if student.active_student:
                 self.scores.append(sad.score)
+        self.invalidate_scores_cache()
 
     def is_inputted(self, with_hidden=False):
         if self.hidden and not with_hidden:
@@ -326,7 +605,61 @@ class Assignment:
         return (self.get_total_possible() == 0 or self.data_loaded)
 
 
+class AssignmentPolicy:
+    """
+    The grading policy of an assignment, shared by all of the StudentAssignmentData created for it.
+    It is immutable: :meth:`Assignment.get_policy` creates a new one when the assignment's policy changes.
+    """
+    FIELDS = (
+        "give_perfect_score",
+        "no_late_time",
+        "blanket_late_penalty",
+        "late_penalty",
+        "max_late_time",
+        "additional_points",
+        "out_of",
+        "extra_credit",
+        "max_slip_count",
+        "does_not_contribute",
+    )
+    __slots__ = ("assignment", "values") + FIELDS
+
+    def __init__(self, assignment: Assignment, values: tuple):
+        object.__setattr__(self, "assignment", assignment)
+        object.__setattr__(self, "values", values)
+        for name, value in zip(self.FIELDS, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AssignmentPolicy is immutable!")
+
+    def replace(self, **changes) -> AssignmentPolicy:
+        """Returns a copy of this policy with the given fields changed."""
+        return AssignmentPolicy(self.assignment, tuple(changes.get(name, value) for name, value in zip(self.FIELDS, self.values)))
+
+    def get_total_possible(self):
+        return self.assignment.get_total_possible()
+
+
 class StudentAssignmentData:
+    __slots__ = (
+        "score",
+        "time_late",
+        "assignment",
+        "name",
+        "sid",
+        "email",
+        "slip_time_used",
+        "extension_time",
+        "data_loaded",
+        "data_found",
+        "dropped",
+        "hidden",
+        "late_interval",
+        "policy",
+        "personal_comment",
+    )
+
     def __init__(self, 
             score: float, 
             time_late: Time, 
@@ -344,8 +677,7 @@ class StudentAssignmentData:
         ):
         if time_late is None:
             time_late = Time()
-        else:
-            self.time_late = time_late
+        self.time_late = time_late
         self.score = 0 if not score else float(score)
         self.assignment = assignment
         self.name = name
@@ -355,24 +687,15 @@ class StudentAssignmentData:
         self.extension_time = extension_time
         self.data_loaded = data_loaded
         self.data_found = data_found
-        self.get_total_possible = assignment.get_total_possible
         self.dropped = dropped
         self.hidden = hidden
         self.late_interval = late_interval
+        # The policy stays the one of the assignment this was created with, even if assignment is changed later (see Group).
+        self.policy = assignment.get_policy()
+        self.personal_comment = ""
 
-        self.give_perfect_score = self.assignment.give_perfect_score
-        self.get_total_possible = self.assignment.get_total_possible
-        self.no_late_time = self.assignment.no_late_time
-        self.blanket_late_penalty = self.assignment.blanket_late_penalty
-        self.late_penalty = self.assignment.late_penalty
-        self.max_late_time = self.assignment.max_late_time
-        self.additional_points = self.assignment.additional_points
-        self.out_of = self.assignment.out_of
-        self.extra_credit = self.assignment.extra_credit
-        self.max_slip_count = self.assignment.category.max_slip_count
-        self.does_not_contribute = self.assignment.does_not_contribute
-        
-        self.reset_comment()
+    def get_total_possible(self):
+        return self.policy.assignment.get_total_possible()
 
     def append_comment(self, *args, sep=' ', end='\n'):
         self.personal_comment += sep.join(args) + end
@@ -405,20 +728,34 @@ class StudentAssignmentData:
     
     def drop_assignment(self):
         self.dropped = True
-        self.append_comment("This assignment has been dropped.")
+        self.append_comment(DROPPED_COMMENT)
+
+    def undrop_assignment(self):
+        if self.dropped:
+            self.dropped = False
+            self.personal_comment = self.personal_comment.replace(DROPPED_COMMENT + "\n", "", 1)
+
+    def reset_processing(self):
+        """Removes the extension, slip time and drop applied while processing the classroom."""
+        self.extension_time = Time()
+        self.slip_time_used = 0
+        self.undrop_assignment()
 
     def get_course_points(self, with_additional_points: bool=True, convert_to_course_points=True):
-        if self.give_perfect_score:
+        if instrumentation.active is not None:
+            instrumentation.active.count("course_points")
+        policy = self.policy
+        if policy.give_perfect_score:
             return self.get_total_possible()
         if self.dropped:
             return 0
-        num_late_time = 0 if self.no_late_time else self.get_num_late()
-        if self.blanket_late_penalty and num_late_time > 0:
+        num_late_time = 0 if policy.no_late_time else self.get_num_late()
+        if policy.blanket_late_penalty and num_late_time > 0:
             num_late_time = 1
-        penalty = (1 - min(num_late_time * self.late_penalty, 1)) if (self.max_late_time is None or num_late_time <= self.max_late_time) else 0
-        score = self.score + (self.additional_points if with_additional_points else 0)
+        penalty = (1 - min(num_late_time * policy.late_penalty, 1)) if (policy.max_late_time is None or num_late_time <= policy.max_late_time) else 0
+        score = self.score + (policy.additional_points if with_additional_points else 0)
         if convert_to_course_points:
-            score *= (self.get_total_possible() / self.out_of)
+            score *= (self.get_total_possible() / policy.out_of)
         return penalty * score
 
     def is_inputted(self, with_hidden=False):
@@ -480,13 +817,21 @@ class StudentAssignmentData:
                     rnk = "N/A"
                 else:
                     rnk = self.assignment.get_rank(score)
-                s += "rank: {} / {}\n".format(rnk, len(self.assignment.scores))
+                s += "rank: {} / {}\n".format(rnk, self.assignment.get_score_count())
 
             if self.assignment.show_stats:
                 s += self.assignment.get_stats_str()
         s += "\n----------\n\n"
         return s
 
+def _policy_property(name: str) -> property:
+    def fset(self, value):
+        self.policy = self.policy.replace(**{name: value})
+    return property(attrgetter("policy." + name), fset, doc=f"The {name} of the assignment's policy.")
+
+for _name in AssignmentPolicy.FIELDS:
+    setattr(StudentAssignmentData, _name, _policy_property(_name))
+
 
 from .category import Category, StudentCategoryData
 from .student import Student
@@ -0,0 +1,252 @@
+"""
+This stores parsed assignment data and fetched google sheets on disk so reruns do not have to parse or download them again.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import numpy
+from .assignment import AssignmentColumns, parse_gradescope_csv
+from .utils import GracePeriod
+
+CACHE_FORMAT_VERSION = 1
+GSHEET_CACHE_FORMAT_VERSION = 1
+COLUMNS = ["sid", "email", "name", "score", "late_seconds", "has_lateness", "graded"]
+META_FILE = "meta.json"
+# The files which map a data file's path, size and mtime to its entry key.
+STAT_DIR = ".stat"
+
+class ParsedDataCache:
+    """
+    An on disk cache of :class:`AssignmentColumns`.
+    Every entry is a directory of .npy files keyed by the file's content hash (and the grace period,
+    which is applied while parsing). The key of each (path, size, mtime) is remembered, so a file is only
+    hashed again when it changed. The arrays are memory mapped when loaded.
+    When max_bytes is set, the least recently used entries are removed to stay under it.
+    """
+    def __init__(self, directory: str, max_bytes: int=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def get_key(self, data_file: str, grace_period: GracePeriod=None) -> str:
+        """Returns the entry key of data_file, its content is only hashed if its path, size or mtime changed."""
+        gp = None
+        if isinstance(grace_period, GracePeriod):
+            gp = (grace_period.time.get_seconds(), grace_period.apply_to_all_late_time)
+        st = os.stat(data_file)
+        stat_key = f"{CACHE_FORMAT_VERSION}|{os.path.abspath(data_file)}|{st.st_size}|{st.st_mtime_ns}|{gp}"
+        stat_path = os.path.join(self.directory, STAT_DIR, hashlib.sha256(stat_key.encode()).hexdigest())
+        try:
+            with open(stat_path) as f:
+                key = f.read()
+            if len(key) == 64:
+                return key
+        except OSError:
+            pass
+        content = hashlib.sha256()
+        with open(data_file, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                content.update(chunk)
+        key = hashlib.sha256(f"{CACHE_FORMAT_VERSION}|{content.hexdigest()}|{gp}".encode()).hexdigest()
+        after = os.stat(data_file)
+        # The key is only remembered if the file did not change while it was hashed.
+        if (after.st_size, after.st_mtime_ns) == (st.st_size, st.st_mtime_ns):
+            os.makedirs(os.path.dirname(stat_path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(stat_path), prefix=".tmp-")
+            with os.fdopen(fd, "w") as f:
+                f.write(key)
+            os.replace(tmp, stat_path)
+        return key
+
+    def get_entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def load(self, data_file: str, grace_period: GracePeriod=None) -> AssignmentColumns:
+        """Returns the columns of data_file, parsing it and storing the result if it is not cached yet."""
+        key = self.get_key(data_file, grace_period)
+        columns = self.read_entry(key)
+        if columns is not None:
+            self.hits += 1
+            return columns
+        self.misses += 1
+        columns = parse_gradescope_csv(data_file, grace_period)
+        self.write_entry(key, columns)
+        self.evict(keep=key)
+        return columns
+
+    def read_entry(self, key: str) -> AssignmentColumns:
+        path = self.get_entry_path(key)
+        try:
+            with open(os.path.join(path, META_FILE)) as f:
+                meta = json.load(f)
+            if meta.get("version") != CACHE_FORMAT_VERSION:
+                return None
+            arrays = {}
+            for name in COLUMNS:
+                if name in meta["columns"]:
+                    arrays[name] = numpy.load(os.path.join(path, name + ".npy"), mmap_mode="r")
+                else:
+                    arrays[name] = None
+        except (OSError, ValueError, KeyError):
+            return None
+        # Marks the entry as recently used for the eviction.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return AssignmentColumns(**arrays)
+
+    def write_entry(self, key: str, columns: AssignmentColumns):
+        path = self.get_entry_path(key)
+        tmp = tempfile.mkdtemp(dir=self.directory, prefix=".tmp-")
+        try:
+            present = []
+            for name in COLUMNS:
+                array = getattr(columns, name)
+                if array is None:
+                    continue
+                numpy.save(os.path.join(tmp, name + ".npy"), numpy.ascontiguousarray(array))
+                present.append(name)
+            with open(os.path.join(tmp, META_FILE), "w") as f:
+                json.dump({"version": CACHE_FORMAT_VERSION, "columns": present}, f)
+            try:
+                os.replace(tmp, path)
+            except OSError:
+                # Another run stored the same entry first.
+                shutil.rmtree(tmp, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    def get_entries(self) -> list:
+        """Returns the (last used, size, path) of every entry."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.startswith("."):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                size = sum(f.stat().st_size for f in os.scandir(path))
+                entries.append((os.stat(path).st_mtime, size, path))
+            except OSError:
+                continue
+        return entries
+
+    def evict(self, keep: str=None):
+        """Removes the least recently used entries until the cache is under max_bytes, except for the entry keep."""
+        if self.max_bytes is None:
+            return
+        keep_path = None if keep is None else self.get_entry_path(keep)
+        entries = sorted(self.get_entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep_path:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.get_entries():
+            shutil.rmtree(path, ignore_errors=True)
+        shutil.rmtree(os.path.join(self.directory, STAT_DIR), ignore_errors=True)
+
+class GSheetCache:
+    """
+    An on disk cache of fetched spreadsheets (see :meth:`GSheetBase.fetch_all_sheets`), set it as :attr:`GSheetBase.sheet_cache`.
+    An entry younger than ttl seconds is used as is. An older entry (or any entry if ttl is None) is used if
+    check_revision is True and the spreadsheet's last update time has not changed, which only costs one small request.
+    In offline mode nothing is downloaded and every spreadsheet is replayed from the cache.
+    """
+    def __init__(self, directory: str, ttl: float=None, check_revision: bool=True, offline: bool=False):
+        self.directory = directory
+        self.ttl = ttl
+        self.check_revision = check_revision
+        self.offline = offline
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        # The spreadsheets are loaded from the client pool's threads.
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def get_entry_path(self, sheet_key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(sheet_key.encode()).hexdigest() + ".json")
+
+    def get_revision(self, sheet_key: str, manager: "GSheetCredentialsManager") -> str:
+        """Returns the last update time of the spreadsheet or None if it can not be fetched."""
+        try:
+            return manager.safe_gspread_call(sheet_key, "get_lastUpdateTime")
+        except Exception as e:
+            print(f"Could not get the last update time of google sheet {sheet_key}: {e}")
+            return None
+
+    def load(self, sheet_key: str, manager: "GSheetCredentialsManager", fetch) -> dict:
+        """Returns the cached sheets of the spreadsheet, calling fetch to download them when the entry is missing or stale."""
+        entry = self.read_entry(sheet_key)
+        if self.offline:
+            if entry is None:
+                raise ValueError(f"The google sheet {sheet_key} is not in the cache {self.directory}!")
+            with self.lock:
+                self.hits += 1
+            return entry["sheets"]
+        if entry is not None and self.ttl is not None and time.time() - entry["fetched_at"] < self.ttl:
+            with self.lock:
+                self.hits += 1
+            return entry["sheets"]
+        revision = None
+        if self.check_revision:
+            revision = self.get_revision(sheet_key, manager)
+            if entry is not None and revision is not None and revision == entry["revision"]:
+                with self.lock:
+                    self.revalidations += 1
+                self.write_entry(sheet_key, entry["sheets"], revision)
+                return entry["sheets"]
+        with self.lock:
+            self.misses += 1
+        sheets = fetch()
+        self.write_entry(sheet_key, sheets, revision)
+        return sheets
+
+    def read_entry(self, sheet_key: str) -> dict:
+        try:
+            with open(self.get_entry_path(sheet_key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("version") != GSHEET_CACHE_FORMAT_VERSION or entry.get("sheet_key") != sheet_key:
+            return None
+        return entry
+
+    def write_entry(self, sheet_key: str, sheets: dict, revision: str):
+        entry = {
+            "version": GSHEET_CACHE_FORMAT_VERSION,
+            "sheet_key": sheet_key,
+            "fetched_at": time.time(),
+            "revision": revision,
+            "sheets": sheets,
+        }
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp, self.get_entry_path(sheet_key))
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.directory, name))
@@ -1,7 +1,25 @@
 from __future__ import annotations
 from .utils import GracePeriod, Time
+from . import instrumentation
+from concurrent.futures import ThreadPoolExecutor
+import itertools
 import numpy as np
 
+# Every category version comes from this counter. next() on it is atomic so invalidations
+# from concurrent assignment loads never reuse a version.
+category_versions = itertools.count(1)
+
+# The most near optimal slip time allocations apply_optimal_slip_time compares exactly (see its docstring).
+MAX_SLIP_TIE_CANDIDATES = 4096
+
+def load_assignments_concurrently(assignments: list, workers: int, bulk: bool=None):
+    """Loads the assignments in a thread pool. Errors are raised in the order of the assignments."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(a.load, bulk) for a in assignments]
+        for future in futures:
+            future.result()
+
+
 class Category:
     def __init__(self,
         name: str, 
@@ -55,18 +73,31 @@ class Category:
         self.max_late_time = None
         self.percentage = percentage
         self.give_perfect_score = give_perfect_score
+        self.version = next(category_versions)
+        self.cache = {}
         print(init_str_done)
 
+    def invalidate_cache(self):
+        """
+        Clears the cached course structure values (total possible, inputted, ...).
+        This is called when assignments are added, removed or loaded. Call it yourself if you
+        modify the category or its assignments directly.
+        """
+        self.version = next(category_versions)
+        self.cache = {}
+
     def add_assignments(self, assignments: list):
         for a in assignments:
             self.add_assignment(a)
 
     def add_assignment(self, assignment):
         self.assignments.append(assignment)
+        self.invalidate_cache()
 
     def remove_assignment(self, assignment):
         if assignment in self.assignments:
             self.assignments.remove(assignment)
+            self.invalidate_cache()
 
     def get_assignment(self, assign_name):
         for a in self.assignments:
@@ -74,11 +105,29 @@ class Category:
                 return a
         return None
 
-    def load_assignment_data(self):
-        for assignment in self.assignments:
-            assignment.load()
+    def load_assignment_data(self, workers: int=None, bulk: bool=None):
+        if workers is None or workers <= 1:
+            for assignment in self.assignments:
+                assignment.load(bulk=bulk)
+        else:
+            load_assignments_concurrently(self.assignments, workers, bulk=bulk)
+
+    def get_percentage_assignments_count(self) -> int:
+        key = ("percentage_count",)
+        # A value computed while the category is invalidated only goes in the replaced cache.
+        cache = self.cache
+        if key not in cache:
+            cache[key] = sum([1 for a in self.assignments if a.percentage is True])
+        return cache[key]
 
     def get_total_possible(self, with_hidden=False, only_inputted=False):
+        key = ("total_possible", with_hidden, only_inputted)
+        cache = self.cache
+        if key not in cache:
+            cache[key] = self.compute_total_possible(with_hidden=with_hidden, only_inputted=only_inputted)
+        return cache[key]
+
+    def compute_total_possible(self, with_hidden=False, only_inputted=False):
         if self.extra_credit:
             return 0
         if self.course_points is not None:
@@ -117,10 +166,11 @@ class Category:
     def all_inputted(self, with_hidden=False):
         if self.hidden and not with_hidden:
             return True
-        for a in self.assignments:
-            if not a.is_inputted(with_hidden=with_hidden):
-                return False
-        return True
+        key = ("all_inputted", with_hidden)
+        cache = self.cache
+        if key not in cache:
+            cache[key] = all(a.is_inputted(with_hidden=with_hidden) for a in self.assignments)
+        return cache[key]
 
     def get_student_data(self, student: Student):
         a_data = []
@@ -165,10 +215,8 @@ class StudentCategoryData:
     def __str__(self):
         return "Category: {}\nAssignments:\n{}".format(self.category.name, self.assignments_data)
 
-    def apply_optimal_slip_time(self, ignore_score=False):
-        max_slip_count = self.max_slip_count
-        if max_slip_count is None:
-            return
+    def get_late_assignments(self, ignore_score=False) -> list:
+        """Returns a list of [assignment data, max slip count usable on it] for every late assignment which can use slip time."""
         late_assignments = []
         for assignment in self.category.assignments:
             if isinstance(assignment.allowed_slip_count, int) and assignment.allowed_slip_count < 0:
@@ -178,14 +226,110 @@ class StudentCategoryData:
                     if assignment_data.get_late_time().get_seconds() > 0 and (assignment_data.score > 0 or ignore_score):
                         late_assignments.append([assignment_data, assignment_data.get_num_late()])
                     break
+        for la in late_assignments:
+            if la[0].assignment.allowed_slip_count is not None:
+                la[1] = min(la[0].assignment.allowed_slip_count, la[1])
+        return late_assignments
+
+    def apply_optimal_slip_time(self, ignore_score=False):
+        """
+        Finds the slip time allocation which maximizes the category total.
+
+        The total is a sum of independent per assignment scores, so this is solved as a
+        knapsack over (assignments x slip count) instead of trying every combination.
+        As many slip counts as possible are used (the smaller of the max slip count and
+        the slip count needed by all late assignments).
+
+        The knapsack sums the scores in another order than :meth:`get_total_score` so its
+        totals can differ in the last bits. Every allocation within a tolerance of the best
+        one is therefore compared with :meth:`get_total_score` and the first best one in the
+        order :meth:`apply_brute_force_slip_time` enumerates them is picked, so both methods
+        agree. Only the first MAX_SLIP_TIE_CANDIDATES of those allocations are compared, which
+        only matters when a lot of allocations have the same score.
+        """
+        max_slip_count = self.max_slip_count
+        if max_slip_count is None:
+            return
+        late_assignments = self.get_late_assignments(ignore_score=ignore_score)
+        if len(late_assignments) == 0:
+            return
+        n = len(late_assignments)
+        budget = min(sum(la[1] for la in late_assignments), max_slip_count)
+        constant_score = self.does_not_contribute or self.override_score is not None
+        # The brute force enumerates combinations with the last assignment varying the
+        # slowest and the first two assignments varying the fastest (np.meshgrid ordering).
+        order = list(range(n - 1, 1, -1)) + [0, 1] if n > 1 else [0]
+
+        values = []
+        for idx in order:
+            assignment_data, max_count = late_assignments[idx]
+            orig_slip_time = assignment_data.slip_time_used
+            vals = []
+            for count in range(max_count + 1):
+                if constant_score:
+                    vals.append(0)
+                    continue
+                assignment_data.slip_time_used = count
+                vals.append(assignment_data.get_course_points())
+            assignment_data.slip_time_used = orig_slip_time
+            values.append(vals)
+
+        instrumentation.count("slip_options", sum(len(vals) for vals in values))
+        # best[k][b] is the best score of the assignments order[k:] using exactly b slip counts.
+        best = [[-np.inf] * (budget + 1) for _ in range(n + 1)]
+        best[n][0] = 0
+        for k in range(n - 1, -1, -1):
+            vals = values[k]
+            nxt = best[k + 1]
+            cur = best[k]
+            for b in range(budget + 1):
+                for count in range(min(len(vals) - 1, b) + 1):
+                    score = vals[count] + nxt[b - count]
+                    if score > cur[b]:
+                        cur[b] = score
+
+        target = best[0][budget]
+        threshold = target - 1e-9 * max(1, abs(target))
+        allocation = [0] * n
+        def near_best(k, remaining, prefix):
+            # Yields the allocations whose knapsack total is close to the best one in enumeration order.
+            if k == n:
+                yield allocation
+                return
+            vals = values[k]
+            for count in range(min(len(vals) - 1, remaining) + 1):
+                if prefix + vals[count] + best[k + 1][remaining - count] >= threshold:
+                    allocation[k] = count
+                    yield from near_best(k + 1, remaining - count, prefix + vals[count])
+
+        best_total = None
+        best_allocation = None
+        for candidate in itertools.islice(near_best(0, budget, 0), MAX_SLIP_TIE_CANDIDATES):
+            for idx, count in zip(order, candidate):
+                late_assignments[idx][0].slip_time_used = count
+            total = self.get_total_score(with_hidden=True)
+            if best_total is None or total > best_total:
+                best_total = total
+                best_allocation = list(candidate)
+        for idx, count in zip(order, best_allocation):
+            late_assignments[idx][0].slip_time_used = count
+        self.validate_slip_days()
+
+    def apply_brute_force_slip_time(self, ignore_score=False):
+        """
+        Tries every slip time allocation and keeps the one which maximizes the category total.
+        This is exponential in the number of late assignments, use :meth:`apply_optimal_slip_time` instead.
+        """
+        max_slip_count = self.max_slip_count
+        if max_slip_count is None:
+            return
+        late_assignments = self.get_late_assignments(ignore_score=ignore_score)
         if len(late_assignments) == 0:
             return
         min_sd_to_use = 0
         possible_sd_per_assignment = []
         for la in late_assignments:
             possible_slip_day_usage = []
-            if la[0].assignment.allowed_slip_count is not None: 
-                la[1] = min(la[0].assignment.allowed_slip_count, la[1])
             min_sd_to_use += la[1]
             for i in range(la[1] + 1):
                 possible_slip_day_usage.append(i)
@@ -199,6 +343,7 @@ class StudentCategoryData:
         def assign_slip_days(assignments, times):
             for a, t in zip(assignments, times):
                 a.slip_time_used = t
+        instrumentation.count("slip_combos", len(combos))
         aments = list(map(lambda x: x[0], late_assignments))
         possible_scores = []
         for combo in combos:
@@ -207,9 +352,6 @@ class StudentCategoryData:
         best_combo_index = np.argmax(possible_scores)
         best_combo = combos[best_combo_index]
         assign_slip_days(aments, best_combo)
-        # print(combos)
-        # print(possible_scores)
-        # print(best_combo)
         self.validate_slip_days()
     
     def validate_slip_days(self):
@@ -226,6 +368,7 @@ class StudentCategoryData:
         slip_time_left = self.max_slip_count
         if slip_time_left is None:
             return
+        evaluated = 0
         for assignment in self.category.assignments:
             if isinstance(assignment.allowed_slip_count, int) and assignment.allowed_slip_count < 0:
                 continue
@@ -237,7 +380,9 @@ class StudentCategoryData:
                         else:
                             assignment_data.slip_time_used = min(assignment_data.get_num_late(), slip_time_left)
                         slip_time_left -= assignment_data.slip_time_used
+                        evaluated += 1
                     break
+        instrumentation.count("slip_options", evaluated)
         self.validate_slip_days()
 
     def drop_lowest_assignments(self):
@@ -284,7 +429,7 @@ class StudentCategoryData:
             total += a.get_course_points()
         return total
 
-    apply_slip_time = apply_ordered_slip_time
+    apply_slip_time = apply_optimal_slip_time
 
 
 from .assignment import Assignment, StudentAssignmentData
@@ -1,16 +1,24 @@
 """
 This is the classroom and its info.
 """
-from .assignment import Category
+from .assignment import Assignment, Category
+from .category import load_assignments_concurrently
+from .curve import CurveSearch
+from . import instrumentation
+from .export import RESULT_COLUMNS, RAW_ADDITIONAL_PTS_COLUMN, Progress, get_assignment_column, get_results_columns, write_results_csv, write_results_npz
 from .grade_bins import GradeBins, PNP
+from .group import Group
+from .score_matrix import ScoreMatrix
+from .sharding import apply_slip_time_and_drop_sharded
+from .summary import ClassSummary, RANKING, GRADE_BINS_COUNT, POINTS_STATS
 from .student import Student
-from .utils import GSheetExtensions, Time, bar_plot_str, get_class_gpa_average, get_class_statistics_str
+from . import utils
+from .utils import GSheetExtensions, Time, get_class_gpa_average, get_class_statistics_str
 import csv
 import json
+import os
 import datetime
 import pytz
-from collections import OrderedDict
-import sys
 import numpy as np
 
 NAME_MARKER = "Name"
@@ -33,21 +41,39 @@ class Classroom:
     :type grade_bins: class:`TotalCoursePoints.GradeBins`
     :param categories: Categories which your class has. You can specify this later.
     :type iface: class: dict, optional
+    :param use_score_matrix: Builds a :class:`TotalCoursePoints.ScoreMatrix` when processing and uses it for class wide computations.
+        The matrix is rebuilt lazily after :meth:`invalidate_cache`.
+    :type use_score_matrix: bool, optional
+    :param gspread_attempts: How many times a google sheets request backs off once every service account's quota is exhausted
+        before giving up, <= 0 retries until success. This sets utils.gspread_attempts so it applies to every request of the process.
+    :type gspread_attempts: int, optional
     """
 
-    def __init__(self, name: str, class_id: str, grade_bins: GradeBins, categories: dict={}, students: list=[], gsheets_grades=None, timezone=pytz.timezone("America/Los_Angeles"), raw_additional_pts: float=0, gs_leaderboard: bool=False):
+    def __init__(self, name: str, class_id: str, grade_bins: GradeBins, categories: dict={}, students: list=[], gsheets_grades=None, timezone=pytz.timezone("America/Los_Angeles"), raw_additional_pts: float=0, gs_leaderboard: bool=False, use_score_matrix: bool=False, gspread_attempts: int=None):
         """Constructor method
         """
 
+        self.ranking_index = {}
+        self.structure_cache = {}
+        self.score_matrix_cache = None
+        # The score matrix can only be built once every student has been processed.
+        self.processed = False
         self.grade_bins = grade_bins
         self.categories = categories
         self.students = students
+        self.rebuild_student_index()
         self.name = name
         self.class_id = class_id
         self.gsheets_grades = gsheets_grades
         self.timezone = timezone
         self.raw_additional_pts = raw_additional_pts
         self.gs_leaderboard = gs_leaderboard
+        self.use_score_matrix = use_score_matrix
+        if gspread_attempts is not None:
+            utils.gspread_attempts = gspread_attempts
+        # The options of the last call to process, refresh_assignment reuses them.
+        self.process_options = {"only_active_students": True}
+        self.class_summary = None
         self.set_time_now()
         self.reset_comment()
         self.reset_welcome()
@@ -58,9 +84,11 @@ class Classroom:
 
     def add_ignore_category(self, name):
         self.ignore_categories.add(name)
+        self.invalidate_cache()
     
     def remove_ignore_category(self, name):
         self.ignore_categories.remove(name)
+        self.invalidate_cache()
     
     def get_ignore_category(self):
         return self.ignore_categories
@@ -101,6 +129,81 @@ class Classroom:
     
     def set_raw_additional_pts(self, pts: float):
         self.raw_additional_pts = pts
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        """
+        Clears everything computed from the students' scores or the course structure.
+        This is called by the classroom whenever it changes the scores. Call it yourself if you modify student data directly.
+        """
+        self.ranking_index = {}
+        self.structure_cache = {}
+        self.score_matrix_cache = None
+
+    @property
+    def score_matrix(self) -> ScoreMatrix:
+        """
+        The score matrix of the processed classroom or None if it is not used (see use_score_matrix).
+        It is rebuilt from the student data the first time it is needed after :meth:`invalidate_cache`.
+        """
+        if self.score_matrix_cache is None and self.use_score_matrix and self.processed:
+            self.score_matrix_cache = ScoreMatrix(self)
+        return self.score_matrix_cache
+
+    def set_class_summary(self, summary: ClassSummary):
+        """
+        Makes the class wide values (ranks, class statistics, assignment scores and stats, ...) come from the summary
+        instead of being computed from the students. Pass None to compute them again.
+        """
+        self.class_summary = summary
+        for cat in self.categories.values():
+            for a in cat.assignments:
+                a.score_summary = None if summary is None else summary.get_assignment(a)
+        self.invalidate_cache()
+
+    def dump_class_summary(self, dest: str) -> ClassSummary:
+        """
+        Writes the class summary of the processed classroom to dest (see :meth:`ClassSummary.save`).
+        The autograder can then load it with :meth:`load_class_summary` and use :meth:`process_for_student`.
+        """
+        summary = ClassSummary.from_classroom(self)
+        summary.save(dest)
+        print(f"Finished dumping the class summary to {dest}!")
+        return summary
+
+    def load_class_summary(self, src: str, check_fresh: bool=True) -> ClassSummary:
+        """
+        Reads a class summary written by :meth:`dump_class_summary`.
+        If check_fresh is True, a ValueError is raised when the classroom's input data has changed since it was written.
+        """
+        return ClassSummary.load(src, c=self if check_fresh else None)
+
+    def get_summary_value(self, key: tuple):
+        """
+        Returns the value of the class summary or None if no class summary is used.
+        Raises a ValueError if the class summary does not have it since only the summarized students are processed.
+        """
+        if self.class_summary is None:
+            return None
+        value = self.class_summary.get(key)
+        if value is None:
+            raise ValueError(f"The value {key} is not in the class summary, process the whole class to compute it!")
+        return value
+
+    def get_cached_structure_value(self, key, compute):
+        """
+        Returns a course structure value (total possible, all inputted, ...) which is only recomputed
+        when one of the categories has been invalidated since it was cached.
+        """
+        value = self.get_summary_value(key)
+        if value is not None:
+            return value
+        versions = tuple(cat.version for cat in self.categories.values())
+        cached = self.structure_cache.get(key)
+        if cached is None or cached[0] != versions:
+            cached = (versions, compute())
+            self.structure_cache[key] = cached
+        return cached[1]
 
     def __repr__(self):
         return self.__str__()
@@ -109,42 +212,97 @@ class Classroom:
         # import ipdb; ipdb.set_trace()
         return "{} ({})\n{}\nStudents:\n{}".format(self.name, self.class_id, self.grade_bins, "\n".join(map(str, self.students)))
 
+    def rebuild_student_index(self):
+        """Rebuilds the SID and email lookups. Call this if self.students was modified directly."""
+        self.sid_index = {}
+        self.email_index = {}
+        self.student_set = set()
+        for s in self.students:
+            self.index_student(s)
+
+    def index_student(self, s: Student):
+        self.student_set.add(s)
+        if s.sid in self.sid_index:
+            print(f"Duplicate SID {s.sid} for students {self.sid_index[s.sid].name} and {s.name}! Lookups will return {self.sid_index[s.sid].name}.")
+        else:
+            self.sid_index[s.sid] = s
+        if s.email in self.email_index:
+            print(f"Duplicate email {s.email} for students {self.email_index[s.email].name} and {s.name}! Lookups will return {self.email_index[s.email].name}.")
+        else:
+            self.email_index[s.email] = s
+
     def add_student(self, s: Student):
         self.students.append(s)
+        self.index_student(s)
+        self.invalidate_cache()
 
     def get_student(self, sid: str):
-        sid = str(sid)
-        for s in self.students:
-            if sid == s.sid:
-                return s
+        return self.sid_index.get(str(sid))
+
+    def get_student_by_email(self, email: str):
+        return self.email_index.get(email)
 
     def remove_student(self, s: Student):
-        if s in self.students:
+        if s in self.student_set:
             self.students.remove(s)
+            self.student_set.remove(s)
+            # If there was a duplicate, the next student with the same key takes over the lookup.
+            if self.sid_index.get(s.sid) is s:
+                del self.sid_index[s.sid]
+                dup = next((other for other in self.students if other.sid == s.sid), None)
+                if dup is not None:
+                    self.sid_index[s.sid] = dup
+            if self.email_index.get(s.email) is s:
+                del self.email_index[s.email]
+                dup = next((other for other in self.students if other.email == s.email), None)
+                if dup is not None:
+                    self.email_index[s.email] = dup
+            self.invalidate_cache()
 
     def add_category(self, c: Category):
         self.categories[c.name] = c
+        self.invalidate_cache()
 
     def remove_category(self, c: str):
         # This is broken
         if c in self.categories:
             del self.categories[c]
+            self.invalidate_cache()
 
     def get_category(self, c: str):
         return self.categories.get(c)
     
+    def get_ranking_index(self, only_active_students=True, with_hidden=False) -> np.ndarray:
+        """
+        Returns the sorted (ascending) total points of the class used for ranking.
+        It is computed once and kept until :meth:`invalidate_cache` is called.
+        """
+        key = (only_active_students, with_hidden)
+        all_points = self.ranking_index.get(key)
+        if all_points is None:
+            all_points = self.get_summary_value((RANKING, only_active_students, with_hidden))
+        if all_points is None:
+            if self.score_matrix is not None:
+                sm = self.score_matrix
+                all_points = sm.get_total_points_with_class(with_hidden=with_hidden)
+                if only_active_students:
+                    all_points = all_points[sm.active]
+            else:
+                all_points = []
+                for student in self.students:
+                    if only_active_students and not student.active_student:
+                        continue
+                    all_points.append(student.get_total_points_with_class(self, with_hidden=with_hidden))
+                all_points = np.array(all_points, dtype=float)
+            all_points = np.sort(all_points)
+            self.ranking_index[key] = all_points
+        return all_points
+
     def get_student_ranking(self, s: Student, only_active_students=True, with_hidden=False):
         s_total_pts = s.get_total_points_with_class(self, with_hidden=with_hidden)
-        all_points = []
-        for student in self.students:
-            if only_active_students and not student.active_student:
-                continue
-            all_points.append(student.get_total_points_with_class(self, with_hidden=with_hidden))
-        all_points = sorted(all_points, reverse=True)
-        rank = 1
-        for s in all_points:
-            if s > s_total_pts:
-                rank += 1
+        all_points = self.get_ranking_index(only_active_students=only_active_students, with_hidden=with_hidden)
+        # The rank is one more than the number of students with strictly more points.
+        rank = 1 + len(all_points) - int(np.searchsorted(all_points, s_total_pts, side="right"))
         return (rank, len(all_points))
     
     def get_student_ranking_str(self, s: Student, only_active_students=True, with_hidden=False):
@@ -201,45 +359,159 @@ class Classroom:
                 self.add_student(s)
 
     def get_total_possible(self, with_hidden=False, only_inputted=False) -> int:
-        points = 0
-        for cat in self.categories.values():
-            if cat.hidden and not with_hidden:
-                continue
-            points += cat.get_total_possible(with_hidden=with_hidden, only_inputted=only_inputted)
-        return points
+        def compute():
+            points = 0
+            for cat in self.categories.values():
+                if cat.hidden and not with_hidden:
+                    continue
+                points += cat.get_total_possible(with_hidden=with_hidden, only_inputted=only_inputted)
+            return points
+        return self.get_cached_structure_value(("total_possible", with_hidden, only_inputted), compute)
 
-    def process(self, with_gsheet_extensions=None, only_active_students=True):
+    def process(self, with_gsheet_extensions=None, only_active_students=True, load_workers: int=None, shard_workers: int=None, shard_size: int=None):
         """
         This function will go through each assigment and get the score for each student.
+        load_workers is the number of threads used to load the assignment data (see :meth:`load_assignment_data`).
+        shard_workers is the number of processes used to apply slip time and drop assignments (see :meth:`apply_slip_time_and_drop_sharded`).
+        Each stage is timed when an :class:`Instrumentation` is running.
         """
+        self.process_options = {"only_active_students": only_active_students}
+        self.processed = False
+        if self.class_summary is not None:
+            self.set_class_summary(None)
+        span = instrumentation.span
         # Since we are making assignments load data when they get created, we should not be calling this.
-        self.load_assignment_data()
+        with span("load_assignment_data"):
+            self.load_assignment_data(workers=load_workers)
         print("Processing classroom data...")
         if only_active_students:
             print("Generating active student data...")
-            for cat in self.categories.values():
-                cat.gen_active_students_scores(self)
+            with span("gen_active_students_scores"):
+                for cat in self.categories.values():
+                    cat.gen_active_students_scores(self)
         print("Matching assignments to students...")
-        self.match_assignments_to_students()
+        with span("match_assignments_to_students"):
+            self.match_assignments_to_students()
         print("Applying extensions...")
-        self.apply_extensions(with_gsheet_extensions=with_gsheet_extensions)
-        print("Applying slip time...")
-        self.apply_slip_time()
-        print("Dropping lowest assignments...")
-        self.drop_lowest_assignments()
+        with span("apply_extensions"):
+            self.apply_extensions(with_gsheet_extensions=with_gsheet_extensions)
+        if shard_workers is not None and shard_workers > 1:
+            print("Applying slip time and dropping lowest assignments...")
+            with span("apply_slip_time_and_drop_sharded", workers=shard_workers):
+                self.apply_slip_time_and_drop_sharded(shard_workers, shard_size=shard_size)
+        else:
+            print("Applying slip time...")
+            with span("apply_slip_time"):
+                self.apply_slip_time()
+            print("Dropping lowest assignments...")
+            with span("drop_lowest_assignments"):
+                self.drop_lowest_assignments()
+        self.processed = True
+        if self.use_score_matrix:
+            print("Building score matrix...")
+            with span("build_score_matrix"):
+                self.build_score_matrix()
         print("Done Processing Classroom Data!")
 
-    def load_assignment_data(self):
-        for category in self.categories.values():
-            category.load_assignment_data()
+    def process_for_student(self, sid: str, class_summary: ClassSummary, with_gsheet_extensions=None, load_workers: int=None) -> Student:
+        """
+        Processes a single student, which is all the autograder needs for one submission.
+        The data files are always bulk loaded (see :attr:`Assignment.bulk_load`) so only this student's rows
+        become StudentAssignmentData, and only this student is matched, extended, slipped and dropped. The class wide values (ranks, statistics,
+        distribution, assignment stats) come from class_summary (see :meth:`ClassSummary.from_classroom`).
+        Returns the student or None if the sid is not in the roster.
+        """
+        student = self.get_student(str(sid))
+        if student is None:
+            print(f"Could not find the student {sid} in the roster!")
+            return None
+        self.processed = False
+        self.load_assignment_data(workers=load_workers, bulk=True)
+        self.set_class_summary(class_summary)
+        print(f"Processing student {sid}...")
+        for cat in self.categories.values():
+            student.add_category_data(cat.get_student_data(student))
+        self.apply_extensions(with_gsheet_extensions=with_gsheet_extensions, students=[student])
+        student.apply_slip_time()
+        student.drop_lowest_assignments()
+        self.invalidate_cache()
+        print(f"Processing student {sid}...Done!")
+        return student
+
+    def get_parent_group(self, assignment: Assignment) -> Group:
+        """Returns the group of a category which contains the assignment or None if it is not part of a group."""
+        for cat in self.categories.values():
+            for a in cat.assignments:
+                if isinstance(a, Group) and a.get_parent_group(assignment) is not None:
+                    return a
+        return None
+
+    def refresh_assignment(self, assignment: Assignment):
+        """
+        Reloads the data of a single assignment after the classroom has been processed and only recomputes
+        what depends on it: the data of its category for every student (extensions, slip time and dropping
+        are applied per category) and the class wide values. If the assignment is part of a group, the group
+        is reloaded instead.
+        """
+        group = self.get_parent_group(assignment)
+        if group is not None:
+            assignment = group
+        category = assignment.category
+        print(f"Refreshing assignment {assignment.id}...")
+        assignment.reset_data()
+        assignment.load()
+        if self.process_options.get("only_active_students"):
+            assignment.gen_active_students_scores(self)
+        for student in self.students:
+            cat_data = student.get_category_data(category)
+            if cat_data is None:
+                cat_data = category.get_student_data(student)
+                student.add_category_data(cat_data)
+            else:
+                cat_data.assignments_data = [a.get_student_data(student) for a in category.assignments]
+            for sad in cat_data.assignments_data:
+                sad.reset_processing()
+            student.apply_extensions(categories=[category.name])
+            cat_data.apply_slip_time()
+            cat_data.drop_lowest_assignments()
+        self.invalidate_cache()
+        print(f"Refreshing assignment {assignment.id}...Done!")
+
+    def build_score_matrix(self) -> ScoreMatrix:
+        """
+        Builds the columnar score matrix from the processed student data and makes the classroom use it
+        (see use_score_matrix). It is rebuilt automatically after :meth:`invalidate_cache`.
+        """
+        self.use_score_matrix = True
+        self.processed = True
+        self.invalidate_cache()
+        self.score_matrix_cache = ScoreMatrix(self)
+        return self.score_matrix_cache
+
+    def load_assignment_data(self, workers: int=None, bulk: bool=None):
+        """
+        Loads the data of every assignment. If workers is more than 1, the assignments
+        (csv files and gsheets) of all categories are loaded concurrently by that many threads.
+        Each assignment only modifies its own data so the result is the same as loading them one by one.
+        bulk overrides :attr:`Assignment.bulk_load` for the data files.
+        """
+        if workers is None or workers <= 1:
+            for category in self.categories.values():
+                category.load_assignment_data(bulk=bulk)
+        else:
+            assignments = [a for category in self.categories.values() for a in category.assignments]
+            load_assignments_concurrently(assignments, workers, bulk=bulk)
+        self.invalidate_cache()
 
     def match_assignments_to_students(self):
         for student in self.students:
             for cat in self.categories.values():
                 cat_data = cat.get_student_data(student)
                 student.add_category_data(cat_data)
+        self.invalidate_cache()
 
-    def apply_extensions(self, with_gsheet_extensions=None, process_gsheet_cell=lambda cell: Time(days=cell)):
+    def apply_extensions(self, with_gsheet_extensions=None, process_gsheet_cell=lambda cell: Time(days=cell), students: list=None):
+        """Applies the students' extensions. If students is given, only their assignment data is updated."""
         if with_gsheet_extensions is not None:
             try:
                 gse = GSheetExtensions(with_gsheet_extensions)
@@ -265,28 +537,56 @@ class Classroom:
                 import traceback
                 traceback.print_exc()
                 print(e)
-        for student in self.students:
+        for student in (self.students if students is None else students):
             # if str(student.sid) == "3031857271":
             #     import ipdb; ipdb.set_trace()
             student.apply_extensions()
+        self.invalidate_cache()
 
     def apply_slip_time(self):
         for student in self.students:
             student.apply_slip_time()
+        self.invalidate_cache()
 
     def drop_lowest_assignments(self):
         for student in self.students:
             student.drop_lowest_assignments()
+        self.invalidate_cache()
+
+    def apply_slip_time_and_drop_sharded(self, workers: int, shard_size: int=None):
+        """
+        Applies slip time and drops the lowest assignments like :meth:`apply_slip_time` followed by
+        :meth:`drop_lowest_assignments`, but the students are split in shards of shard_size which are
+        processed by a pool of workers processes. Only a compact form of each student's data is sent
+        to the workers and the results are merged back, so the output is identical to the serial path.
+        """
+        apply_slip_time_and_drop_sharded(self, workers, shard_size=shard_size)
+        self.invalidate_cache()
 
     def all_inputted(self, with_hidden=False) -> bool:
-        for c in self.categories.values():
-            if not c.all_inputted(with_hidden=with_hidden):
-                return False
-        return True
+        def compute():
+            for c in self.categories.values():
+                if not c.all_inputted(with_hidden=with_hidden):
+                    return False
+            return True
+        return self.get_cached_structure_value(("all_inputted", with_hidden), compute)
 
     def get_grade_bins_count(self, with_hidden=False, pnp_as_grade=False, show_pnp=True, actual_grades=False):
+        summary_counts = self.get_summary_value((GRADE_BINS_COUNT, with_hidden, pnp_as_grade, show_pnp, actual_grades))
+        if summary_counts is not None:
+            return dict(summary_counts)
         grade_bin_counts = {}
         all_in = self.all_inputted()
+        if self.score_matrix is not None:
+            sm = self.score_matrix
+            grades = sm.get_grade_ids(with_hidden=with_hidden, ignore_pnp=pnp_as_grade, approx=not (all_in or actual_grades))
+            for i, gb in enumerate(grades):
+                if not sm.active[i]:
+                    continue
+                std_is_pnp = (not sm.for_grade[i] and sm.grade_status[i] in PNP.PNP_Types.keys())
+                if show_pnp or not std_is_pnp:
+                    grade_bin_counts[gb] = grade_bin_counts.get(gb, 0) + 1
+            return grade_bin_counts
         for student in self.students:
             if student.active_student:
                 std_is_pnp = (not student.is_for_grade() and student.grade_status in PNP.PNP_Types.keys())
@@ -316,13 +616,25 @@ class Classroom:
         print(self.get_class_statistics_str(*args, **kwargs))
 
     def get_class_points_stats_str(self, with_hidden=False, skip_non_roster=True, with_quartile=True, only_for_grade=True):
-        all_points = []
-        for student in self.students:
-            if skip_non_roster and not student.active_student:
-                continue
-            if only_for_grade and not student.is_for_grade():
-                continue
-            all_points.append(student.get_total_points_with_class(self, with_hidden=with_hidden))
+        summary_str = self.get_summary_value((POINTS_STATS, with_hidden, skip_non_roster, with_quartile, only_for_grade))
+        if summary_str is not None:
+            return summary_str
+        if self.score_matrix is not None:
+            sm = self.score_matrix
+            mask = np.ones(len(sm.students), dtype=bool)
+            if skip_non_roster:
+                mask &= sm.active
+            if only_for_grade:
+                mask &= sm.for_grade
+            all_points = sm.get_total_points_with_class(with_hidden=with_hidden)[mask].tolist()
+        else:
+            all_points = []
+            for student in self.students:
+                if skip_non_roster and not student.active_student:
+                    continue
+                if only_for_grade and not student.is_for_grade():
+                    continue
+                all_points.append(student.get_total_points_with_class(self, with_hidden=with_hidden))
         if len(all_points) == 0:
             all_points.append(0)
         mean = np.mean(all_points)
@@ -337,80 +649,127 @@ class Classroom:
                 quartile += f"{p}th percentile: {np.percentile(all_points, p)}\n"
         return f"mean: {mean}\nmedian: {median}\nstd dev: {std}\nmax: {pmax}\nmin: {pmin}{quartile}"
 
-    def est_gpa(self, min_ave_gpa, start_pts=1, max_pts=20, max_a_plus=None, adjust_a_plus: bool=True, with_hidden=False, pnp_as_grade=False):
-        orig_bins = self.grade_bins
-        base_raw_points = self.get_raw_additional_pts()
-        have_max_a_plus = max_a_plus == 0
-        a_plus_adjust = 0
-        for i in range(start_pts, 1 + max_pts):
-            if adjust_a_plus and max_a_plus is None:
-                self.grade_bins = orig_bins.copy()
-                self.grade_bins.increment_A_plus(i)
-            if have_max_a_plus:
-                a_plus_adjust += 1
-                print(f"Adjusting A+ bin by {a_plus_adjust} points.")
-                self.grade_bins = orig_bins.copy()
-                self.grade_bins.increment_A_plus(a_plus_adjust)
-            self.set_raw_additional_pts(i)
-            gbc = self.get_grade_bins_count(with_hidden=with_hidden, pnp_as_grade=pnp_as_grade)
-            a_plus = gbc.get("A+")
-            a_plus = 0 if a_plus is None else a_plus
-            ave_gpa = self.get_class_gpa_average(gbc)
-            print(f"Stats when adding {i} points(s):\n{self.get_class_statistics_str(gbc)}")
-            if ave_gpa >= min_ave_gpa:
-                print("Found the minimum number of points to reach the ave gpa wanted!")
-                if max_a_plus is not None and a_plus_adjust > 0:
-                    print(f"The A+ bin must be shifted up by {a_plus_adjust} points!")
-                self.set_raw_additional_pts(base_raw_points)
-                self.grade_bins = orig_bins
-                if a_plus_adjust > 0:
-                    return (i, a_plus_adjust)
-                return i
-            
-            if (not have_max_a_plus) and max_a_plus is not None and a_plus >= max_a_plus:
-                print("Max A+ reached!")
-                have_max_a_plus = True
-        print("Could not reach the minimum average gpa for the given number of iterations!")
-        self.set_raw_additional_pts(base_raw_points)
-        self.grade_bins = orig_bins
-        return False
-        
-
-    def dump_student_results(self, filename: str, approx_grade=False, skip_non_roster=True, include_assignment_scores=False, with_hidden=True) -> None:
-        """This function will dump the students in the class in a csv file."""
-        csv_columns = ["name", "sid", "email", "grade", "score", "Grading Basis"]
+    def get_class_stats_results_str(self, class_dist: bool=False, class_stats_all: bool=False, class_stats_graded: bool=False) -> str:
+        """Returns the class stats section of the students' results (see :meth:`Student.dump_str`)."""
+        stats_str = ""
+        if class_stats_graded:
+            title = "Class Statistics (Graded):"
+            stats_str += f"{title}\n" + ("-" * len(title)) + "\n"
+            stats_str += self.get_class_points_stats_str()
+            stats_str += "\n"
+        if class_stats_all:
+            title = "Class Statistics (All):"
+            stats_str += f"{title}\n" + ("-" * len(title)) + "\n"
+            stats_str += self.get_class_points_stats_str(only_for_grade=False)
+            stats_str += "\n"
+        if class_dist:
+            if class_stats_all or class_stats_graded:
+                stats_str += ("_" * 35) + ("\n" * 2)
+            stats_str += self.get_class_statistics_str()
+        return stats_str
+
+    def dump_all_results(self, dest: str, class_dist: bool=False, class_stats_all: bool=False, class_stats_graded: bool=False, include_rank=False, jsonl: bool=False, skip_non_roster=False) -> None:
+        """
+        Writes every student's Gradescope results in one pass.
+        The class wide sections (statistics, distribution and ranks) are computed once and shared by all students.
 
+        If jsonl is False, dest is a directory and each student's results are written to dest/<sid>.json.
+        Otherwise dest is a file which gets one {"sid": ..., "results": ...} line per student.
+        """
+        class_stats_str = None
+        if class_dist or class_stats_all or class_stats_graded:
+            class_stats_str = self.get_class_stats_results_str(class_dist=class_dist, class_stats_all=class_stats_all, class_stats_graded=class_stats_graded)
+        if include_rank:
+            # Builds the ranking index once so each student's rank is a lookup.
+            self.get_ranking_index()
+        if jsonl:
+            out = open(dest, "w")
+        else:
+            os.makedirs(dest, exist_ok=True)
+        written = 0
+        try:
+            for student in self.students:
+                if skip_non_roster and not student.active_student:
+                    continue
+                results = student.dump_str(self, class_dist=class_dist, class_stats_all=class_stats_all, class_stats_graded=class_stats_graded, include_rank=include_rank, class_stats_str=class_stats_str)
+                if jsonl:
+                    out.write(json.dumps({"sid": student.sid, "results": results}, ensure_ascii=False) + "\n")
+                else:
+                    student.dump_data(os.path.join(dest, f"{student.sid}.json"), results)
+                written += 1
+        finally:
+            if jsonl:
+                out.close()
+        print(f"Finished dumping results for {written} students!")
+
+    def est_gpa(self, min_ave_gpa, start_pts=1, max_pts=20, max_a_plus=None, adjust_a_plus: bool=True, with_hidden=False, pnp_as_grade=False, step: float=1):
+        """
+        Finds the smallest raw additional points (from start_pts to max_pts in increments of step) which makes the class
+        GPA average reach min_ave_gpa. Every curve is evaluated at once (see :class:`CurveSearch`).
+        If max_a_plus is None and adjust_a_plus is True, the A+ bin is shifted up by the added points.
+        Otherwise once there are max_a_plus A+ students, the A+ bin is shifted up by step for each following step
+        and (points, A+ shift) is returned.
+        Returns False if the GPA average can not be reached.
+        """
+        curve = CurveSearch(self, with_hidden=with_hidden, pnp_as_grade=pnp_as_grade)
+        offsets = start_pts + step * np.arange(int(np.floor((max_pts - start_pts) / step + 1e-9)) + 1)
+        a_plus_shifts = np.zeros_like(offsets)
+        if max_a_plus is None:
+            if adjust_a_plus:
+                a_plus_shifts = offsets.copy()
+        elif max_a_plus == 0:
+            a_plus_shifts = step * np.arange(1, len(offsets) + 1)
+        else:
+            reached = np.nonzero(curve.get_a_plus_counts(offsets) >= max_a_plus)[0]
+            if len(reached) > 0:
+                first = reached[0]
+                print(f"Max A+ reached when adding {offsets[first]} point(s)!")
+                a_plus_shifts[first + 1:] = step * np.arange(1, len(offsets) - first)
+        counts = curve.get_counts(offsets, a_plus_shifts=a_plus_shifts)
+        found = np.nonzero(curve.get_gpa_averages(offsets, counts=counts) >= min_ave_gpa)[0]
+        if len(found) == 0:
+            print("Could not reach the minimum average gpa for the given number of iterations!")
+            return False
+        i = found[0]
+        pts = offsets[i].item()
+        grade_bins = self.grade_bins.copy()
+        grade_bins.increment_A_plus(a_plus_shifts[i])
+        gbc = {curve.labels[l]: int(counts[i, l]) for l in np.nonzero(counts[i])[0]}
+        print(f"Stats when adding {pts} points(s):\n{get_class_statistics_str(gbc, grade_bins)}")
+        print("Found the minimum number of points to reach the ave gpa wanted!")
+        if max_a_plus is not None and a_plus_shifts[i] > 0:
+            a_plus_adjust = a_plus_shifts[i].item()
+            print(f"The A+ bin must be shifted up by {a_plus_adjust} points!")
+            return (pts, a_plus_adjust)
+        return pts
+
+    def dump_student_results(self, filename: str, approx_grade=False, skip_non_roster=True, include_assignment_scores=False, with_hidden=True, columns: list=None, output_format: str="csv", progress_interval: float=1) -> None:
+        """
+        This function will dump the students in the class in a csv file.
+        Only the requested columns are computed (see :func:`get_results_columns`), columns defaults to the name, sid, email,
+        grade, score and grading basis. If output_format is "npz", a numpy archive with one array per column is written instead.
+        """
+        if columns is None:
+            columns = list(RESULT_COLUMNS)
+        else:
+            columns = list(columns)
         if include_assignment_scores:
             for cat in self.categories.values():
                 for assign in cat.assignments:
-                    csv_columns.append(f"{cat.name}/{assign.id}")
+                    columns.append(get_assignment_column(cat, assign))
             if self.get_raw_additional_pts() != 0:
-                csv_columns.append("Raw Additional Pts")
-
-        with open(filename, "w+") as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=csv_columns)
-            writer.writeheader()
-            base_str = f"Dumping student {{}} / {len(self.students)} ({{}})"
-            print(base_str.format(0, None))
-            counter = 0
-            for student in self.students:
-                counter += 1
-                sys.stdout.write("\033[F\033[K")
-                print(base_str.format(counter, student.name))
-                if not student.active_student:
-                    continue
-                sdata = student.get_raw_data(self, approx_grade=approx_grade, with_hidden=with_hidden)
-                if include_assignment_scores:
-                    add_pts = self.get_raw_additional_pts()
-                    if add_pts != 0:
-                        sdata["Raw Additional Pts"] = add_pts
-                d = {}
-                for idv in csv_columns:
-                    d[idv] = sdata[idv]
-                writer.writerow(d)
-            
-            sys.stdout.write("\033[F\033[K")
-            print("Finished dumping classroom data!")
+                columns.append(RAW_ADDITIONAL_PTS_COLUMN)
+        if output_format not in ("csv", "npz"):
+            raise ValueError(f"Unknown output format {output_format}!")
+
+        students = [s for s in self.students if s.active_student or not skip_non_roster]
+        progress = Progress(f"Dumping student {{}} / {len(students)}", len(students), interval=progress_interval)
+        results = get_results_columns(self, students, columns, approx_grade=approx_grade, with_hidden=with_hidden, progress=progress)
+        if output_format == "npz":
+            write_results_npz(filename, results)
+        else:
+            write_results_csv(filename, results)
+        progress.done("Finished dumping classroom data!")
 
     def gen_calcentral_report(self, dest_filename:str, calcentral_roster_filename:str, comment_fn=lambda sid: ""):
         csv_columns = ["SID", "Name", "Grade", "Grading Basis", "Comments"]
@@ -0,0 +1,171 @@
+"""
+This evaluates the class' grade distribution for many curves (raw additional points and A+ bin shifts) at once.
+"""
+from __future__ import annotations
+import numpy as np
+from .grade_bins import GradeBinsError, PNP, get_bound
+
+INCOMPLETE_GRADE = "I"
+
+class CurveSearch:
+    """
+    Computes the students' totals once and then evaluates the grade bin counts and the class GPA average
+    for a whole vector of raw additional points (see :meth:`Classroom.set_raw_additional_pts`) with array operations.
+    The results match :meth:`Classroom.get_grade_bins_count` for the active students.
+
+    :param c: The processed classroom.
+    :type c: class:`TotalCoursePoints.Classroom`
+    """
+    def __init__(self, c: "Classroom", with_hidden=False, pnp_as_grade=False, actual_grades=False):
+        self.classroom = c
+        self.grade_bins = c.grade_bins
+        if c.score_matrix is not None:
+            sm = c.score_matrix
+            rows = np.nonzero(sm.active)[0]
+            self.base_totals = sm.get_totals(with_hidden=with_hidden)[rows]
+            self.incomplete = sm.incomplete[rows]
+            for_grade = sm.for_grade[rows].tolist()
+            statuses = [sm.grade_status[i] for i in rows]
+        else:
+            students = [s for s in c.students if s.active_student]
+            self.base_totals = np.array([s.total_points(c=c, with_hidden=with_hidden) for s in students], dtype=float)
+            self.incomplete = np.array([bool(s.incomplete) for s in students], dtype=bool)
+            for_grade = [s.is_for_grade() for s in students]
+            statuses = [s.grade_status for s in students]
+        tp = c.get_total_possible()
+        if tp == 0:
+            tp = 1
+        self.max_score = c.get_total_possible(only_inputted=True)
+        # The raw additional points are scaled by the ratio of inputted points (see Student.get_total_points_with_class).
+        self.offset_factor = self.max_score / tp
+        self.approx = not (c.all_inputted() or actual_grades)
+        if self.approx and self.grade_bins.normal_max_points is None:
+            raise GradeBinsError("There is no max score set!")
+
+        self.labels = []
+        self.label_index = {}
+        bins = self.grade_bins.get_bins()
+        for b in bins:
+            self.get_label(b.id)
+        self.bin_min = np.array([get_bound(b.min, -np.inf) for b in bins], dtype=float)
+        self.bin_max = np.array([get_bound(b.max, np.inf) for b in bins], dtype=float)
+        self.a_plus_bins = None
+        bin_ids = [b.id for b in bins]
+        if "A+" in bin_ids and "A" in bin_ids:
+            self.a_plus_bins = (bin_ids.index("A+"), bin_ids.index("A"))
+
+        # The PNP students get a pass or not pass label instead of a bin.
+        n = len(self.base_totals)
+        self.pnp = np.zeros(n, dtype=bool)
+        self.pass_threshold = np.full(n, np.inf)
+        self.pass_label = np.zeros(n, dtype=np.int64)
+        self.not_pass_label = np.zeros(n, dtype=np.int64)
+        for i, status in enumerate(statuses):
+            if pnp_as_grade or for_grade[i] or status not in PNP.PNP_Types:
+                continue
+            pnp = PNP.PNP_Types[status]
+            self.pnp[i] = True
+            self.pass_threshold[i] = self.grade_bins.get_pass_threshold(status)
+            self.pass_label[i] = self.get_label(pnp.pass_value)
+            self.not_pass_label[i] = self.get_label(pnp.not_pass_value)
+        self.incomplete_label = self.get_label(INCOMPLETE_GRADE)
+        self.no_bin_label = self.get_label(None)
+
+    def get_label(self, grade_id: str) -> int:
+        label = self.label_index.get(grade_id)
+        if label is None:
+            label = len(self.labels)
+            self.labels.append(grade_id)
+            self.label_index[grade_id] = label
+        return label
+
+    def get_scores(self, offsets: np.ndarray) -> np.ndarray:
+        """Returns the offsets x students matrix of the scores the grade bins are applied to."""
+        offsets = np.asarray(offsets, dtype=float).reshape(-1, 1)
+        scores = self.base_totals + (offsets * self.offset_factor)
+        if self.approx:
+            max_score = self.max_score if self.max_score != 0 else 1
+            scores = (scores / max_score) * self.grade_bins.normal_max_points
+        return scores
+
+    def get_labels(self, offsets: np.ndarray, a_plus_shifts: np.ndarray=None) -> np.ndarray:
+        """
+        Returns the offsets x students matrix of grade labels (indexes in :attr:`labels`).
+        a_plus_shifts is the amount the A+ bin is shifted up by for each offset (see :meth:`GradeBins.increment_A_plus`).
+        """
+        scores = self.get_scores(offsets)
+        k = len(scores)
+        bin_min = np.broadcast_to(self.bin_min, (k, len(self.bin_min))).copy()
+        bin_max = np.broadcast_to(self.bin_max, (k, len(self.bin_max))).copy()
+        if a_plus_shifts is not None and self.a_plus_bins is not None:
+            a_plus, a = self.a_plus_bins
+            shifts = np.broadcast_to(np.asarray(a_plus_shifts, dtype=float), (k,))
+            bin_min[:, a_plus] += shifts
+            bin_max[:, a] += shifts
+        labels = np.full(scores.shape, self.no_bin_label, dtype=np.int64)
+        unmatched = np.ones(scores.shape, dtype=bool)
+        # The first bin which contains the score wins, like GradeBins.in_bin.
+        for b in range(bin_min.shape[1]):
+            matched = unmatched & (scores >= bin_min[:, b, None]) & (scores < bin_max[:, b, None])
+            labels[matched] = b
+            unmatched &= ~matched
+        if self.pnp.any():
+            passing = scores >= self.pass_threshold
+            labels = np.where(self.pnp, np.where(passing, self.pass_label, self.not_pass_label), labels)
+        labels[:, self.incomplete] = self.incomplete_label
+        return labels
+
+    def get_counts(self, offsets: np.ndarray, a_plus_shifts: np.ndarray=None) -> np.ndarray:
+        """Returns the offsets x labels matrix of the number of students with each grade."""
+        labels = self.get_labels(offsets, a_plus_shifts=a_plus_shifts)
+        L = len(self.labels)
+        rows = np.arange(len(labels)).reshape(-1, 1) * L
+        return np.bincount((labels + rows).ravel(), minlength=len(labels) * L).reshape(len(labels), L)
+
+    def get_grade_bins_counts(self, offsets: np.ndarray, a_plus_shifts: np.ndarray=None) -> list:
+        """Returns the grade bin counts (see :meth:`Classroom.get_grade_bins_count`) of each offset."""
+        counts = self.get_counts(offsets, a_plus_shifts=a_plus_shifts)
+        return [{self.labels[l]: int(row[l]) for l in np.nonzero(row)[0]} for row in counts]
+
+    def get_gpa_averages(self, offsets: np.ndarray, a_plus_shifts: np.ndarray=None, counts: np.ndarray=None) -> np.ndarray:
+        """Returns the class GPA average (see :func:`get_class_gpa_average`) of each offset."""
+        if counts is None:
+            counts = self.get_counts(offsets, a_plus_shifts=a_plus_shifts)
+        gpa_values = np.zeros(len(self.labels))
+        in_gpa = np.zeros(len(self.labels), dtype=bool)
+        for b in self.grade_bins.get_bins():
+            label = self.label_index[b.id]
+            gpa_values[label] = b.get_gpa_value()
+            in_gpa[label] = True
+        total_count = counts[:, in_gpa].sum(axis=1)
+        total_pts = counts @ gpa_values
+        return np.where(total_count == 0, 0, total_pts / np.maximum(total_count, 1))
+
+    def get_a_plus_counts(self, offsets: np.ndarray, a_plus_shifts: np.ndarray=None, counts: np.ndarray=None) -> np.ndarray:
+        if counts is None:
+            counts = self.get_counts(offsets, a_plus_shifts=a_plus_shifts)
+        label = self.label_index.get("A+")
+        if label is None:
+            return np.zeros(len(counts), dtype=np.int64)
+        return counts[:, label]
+
+    def find_min_offset(self, min_ave_gpa: float, start_pts: float=0, max_pts: float=20, a_plus_shift: float=0, tolerance: float=1e-3):
+        """
+        Binary searches the smallest offset in [start_pts, max_pts] (within tolerance) whose class GPA average is
+        at least min_ave_gpa. The GPA average does not decrease when the offset grows since the bins are fixed.
+        Returns None if max_pts is not enough.
+        """
+        def gpa(offset):
+            return self.get_gpa_averages([offset], a_plus_shifts=[a_plus_shift])[0]
+        if gpa(max_pts) < min_ave_gpa:
+            return None
+        if gpa(start_pts) >= min_ave_gpa:
+            return start_pts
+        lo, hi = start_pts, max_pts
+        while hi - lo > tolerance:
+            mid = (lo + hi) / 2
+            if gpa(mid) >= min_ave_gpa:
+                hi = mid
+            else:
+                lo = mid
+        return hi
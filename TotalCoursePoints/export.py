@@ -0,0 +1,129 @@
+"""
+This writes the students' results (see :meth:`Classroom.dump_student_results`) column by column.
+"""
+from __future__ import annotations
+import csv
+import sys
+import time
+import numpy as np
+
+RESULT_COLUMNS = ["name", "sid", "email", "grade", "score", "Grading Basis"]
+STRING_COLUMNS = {"name", "sid", "email", "grade", "Grading Basis"}
+RAW_ADDITIONAL_PTS_COLUMN = "Raw Additional Pts"
+WRITE_BUFFER_SIZE = 1 << 20
+
+class Progress:
+    """Prints the progress of a loop in place, at most once every interval seconds."""
+    def __init__(self, base_str: str, total: int, interval: float=1):
+        self.base_str = base_str
+        self.total = total
+        self.interval = interval
+        self.last = time.monotonic()
+        print(self.base_str.format(0, total))
+
+    def update(self, count: int):
+        now = time.monotonic()
+        if now - self.last < self.interval:
+            return
+        self.last = now
+        sys.stdout.write("\033[F\033[K")
+        print(self.base_str.format(count, self.total))
+
+    def done(self, message: str):
+        sys.stdout.write("\033[F\033[K")
+        print(message)
+
+def get_assignment_column(cat, assignment) -> str:
+    return f"{cat.name}/{assignment.id}"
+
+def get_results_columns(c: "Classroom", students: list, columns: list, approx_grade: bool=False, with_hidden: bool=True, progress: Progress=None) -> dict:
+    """
+    Returns the values of the requested columns (see :meth:`Student.get_raw_data`) for every student, indexed by the column.
+    Only the requested columns are computed. The score matrix is used if it has been built.
+    """
+    assignments = {}
+    for cat in c.categories.values():
+        for a in cat.assignments:
+            assignments[get_assignment_column(cat, a)] = a
+    wanted = set(columns)
+    need_score = "score" in wanted or "grade" in wanted
+    results = {}
+    sm = c.score_matrix
+    rows = None
+    if sm is not None:
+        rows = [sm.get_student_index(s) for s in students]
+        if any(row is None for row in rows):
+            rows = None
+    if rows is not None:
+        if need_score:
+            results["score"] = sm.get_total_points_with_class(with_hidden=with_hidden)[rows].tolist()
+        if "grade" in wanted:
+            grades = sm.get_grade_ids(with_hidden=with_hidden, approx=approx_grade)
+            results["grade"] = [grades[row] for row in rows]
+        assignment_columns = [col for col in columns if col in assignments]
+        if assignment_columns:
+            cp = sm.get_course_points()
+            for col in assignment_columns:
+                a = assignments[col]
+                j = sm.assignment_index[a]
+                if a.give_perfect_score:
+                    results[col] = [a.get_total_possible()] * len(rows)
+                else:
+                    # Dropped assignments are written as an int 0 like StudentAssignmentData.get_course_points.
+                    results[col] = [0 if dropped else points for points, dropped in zip(cp[rows, j].tolist(), sm.dropped[rows, j].tolist())]
+    else:
+        scores = []
+        grades = []
+        assignment_columns = {col: [] for col in columns if col in assignments}
+        for i, student in enumerate(students):
+            if need_score:
+                score = student.get_total_points_with_class(c, with_hidden=with_hidden)
+                scores.append(score)
+                if "grade" in wanted:
+                    if approx_grade:
+                        grades.append(student.get_approx_grade_id(c, score=score, with_hidden=with_hidden))
+                    else:
+                        grades.append(student.get_grade(c, score=score, with_hidden=with_hidden))
+            for col, values in assignment_columns.items():
+                sad = student.get_assignment_data(assignments[col])
+                if sad is None:
+                    raise ValueError(f"The student {student.sid} has no data for the assignment {col}, process the classroom first!")
+                values.append(sad.get_course_points())
+            if progress is not None:
+                progress.update(i + 1)
+        if need_score:
+            results["score"] = scores
+        if "grade" in wanted:
+            results["grade"] = grades
+        results.update(assignment_columns)
+    for col in columns:
+        if col == "name":
+            results[col] = [s.name for s in students]
+        elif col == "sid":
+            results[col] = [s.sid for s in students]
+        elif col == "email":
+            results[col] = [s.email for s in students]
+        elif col == "Grading Basis":
+            results[col] = [s.grade_status for s in students]
+        elif col == RAW_ADDITIONAL_PTS_COLUMN:
+            results[col] = [c.get_raw_additional_pts()] * len(students)
+        elif col not in results:
+            raise ValueError(f"Unknown results column {col}!")
+    return {col: results[col] for col in columns}
+
+def write_results_csv(filename: str, results: dict):
+    with open(filename, "w+", buffering=WRITE_BUFFER_SIZE) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(results.keys())
+        writer.writerows(zip(*results.values()))
+
+def write_results_npz(filename: str, results: dict):
+    """Writes a numpy archive with one array per column, the string columns are unicode arrays."""
+    arrays = {}
+    for col, values in results.items():
+        if col in STRING_COLUMNS:
+            arrays[col] = np.array(["" if v is None else str(v) for v in values], dtype=str)
+        else:
+            arrays[col] = np.array(values, dtype=float)
+    with open(filename, "wb") as f:
+        np.savez(f, **arrays)
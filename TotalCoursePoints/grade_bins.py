@@ -1,6 +1,9 @@
 """
 Grade bins.
 """
+from bisect import bisect_right
+import numpy as np
+
 class GradeBinsError(Exception):
     pass
 
@@ -78,8 +81,49 @@ class Bin:
     def in_relative_bin(self, percentage:float, max_points:float):
         return self.in_bin(percentage * max_points)
 
+def get_bound(value, default: float) -> float:
+    if value is None:
+        return default
+    if isinstance(value, Max):
+        return np.inf
+    return value
+
+class CompiledBins:
+    """
+    The bins as sorted boundaries. Between two consecutive boundaries every score is in the same bin,
+    so a score's bin is the owner of the interval found by searchsorted.
+    """
+    def __init__(self, bins: list):
+        edges = set()
+        for b in bins:
+            if b.min is not None:
+                edges.add(get_bound(b.min, -np.inf))
+            if b.max is not None:
+                edges.add(get_bound(b.max, np.inf))
+        self.edges = sorted(edges)
+        self.edges_array = np.array(self.edges, dtype=float)
+        lows = [-np.inf] + self.edges
+        highs = self.edges + [np.inf]
+        # The first bin which contains the whole [low, high) interval owns it, like GradeBins.in_bin.
+        self.owners = []
+        for low, high in zip(lows, highs):
+            owner = None
+            for b in bins:
+                if get_bound(b.min, -np.inf) <= low and high <= get_bound(b.max, np.inf):
+                    owner = b
+                    break
+            self.owners.append(owner)
+        self.owner_ids = np.array([None if b is None else b.id for b in self.owners], dtype=object)
+
+    def in_bin(self, value: float) -> Bin:
+        return self.owners[bisect_right(self.edges, value)]
+
+    def in_bin_many(self, values: np.ndarray) -> np.ndarray:
+        return self.owner_ids[np.searchsorted(self.edges_array, values, side="right")]
+
 class GradeBins:
     def __init__(self, bins: list = [], pass_threshold: Bin = None, pass_threshold_map: Bin = None, normal_max_points: float = None, uniform_adjust: float =  None):
+        self.compiled = None
         self.bins = {}
         mxpts = None
         for b in bins:
@@ -141,12 +185,23 @@ class GradeBins:
             #     import ipdb; ipdb.set_trace()
             #     raise ValueError("The new bin {} conflict with an existing bin {}!".format(new_bin, b))
         self.bins[new_bin.id] = new_bin
+        self.invalidate_cache()
     
     def remove_bin(self, id: str) -> bool:
         if id in self.bins:
             del self.bins[id]
+            self.invalidate_cache()
             return True
         return False
+
+    def invalidate_cache(self):
+        """Clears the compiled bins. Call this if you modify a bin's min or max directly."""
+        self.compiled = None
+
+    def get_compiled(self) -> CompiledBins:
+        if self.compiled is None:
+            self.compiled = CompiledBins(self.get_bins())
+        return self.compiled
     
     def get_bins(self) -> [Bin]:
         return list(self.bins.values())
@@ -155,15 +210,39 @@ class GradeBins:
         return self.bins.get(id)
 
     def in_bin(self, value: float) -> Bin:
-        for b in self.bins.values():
-            if value in b:
-                return b
-        return None
+        if value is None:
+            for b in self.bins.values():
+                if value in b:
+                    return b
+            return None
+        return self.get_compiled().in_bin(value)
 
-    def is_passing(self, value: float, grade_type: str=None) -> bool:
+    def in_bin_many(self, scores: np.ndarray) -> np.ndarray:
+        """Returns the id of the bin of each score (None if it is not in a bin)."""
+        return self.get_compiled().in_bin_many(np.asarray(scores, dtype=float))
+
+    def get_pass_threshold(self, grade_type: str=None) -> float:
+        """
+        Returns the passing score of the grade type (see pass_threshold_map) as a number.
+        A Max threshold can never be reached (inf) and a None threshold (a bin without a min) is always reached (-inf).
+        """
+        threshold = self.pass_threshold
         if grade_type is not None and grade_type in self.pass_threshold_map:
-            return value >= self.pass_threshold_map[grade_type]
-        return value >= self.pass_threshold
+            threshold = self.pass_threshold_map[grade_type]
+        return get_bound(threshold, -np.inf)
+
+    def get_pass_thresholds(self, grade_types: list) -> np.ndarray:
+        return np.array([self.get_pass_threshold(t) for t in grade_types], dtype=float)
+
+    def is_passing(self, value: float, grade_type: str=None) -> bool:
+        return value >= self.get_pass_threshold(grade_type)
+
+    def is_passing_many(self, scores: np.ndarray, grade_types: list=None) -> np.ndarray:
+        """Returns if each score is passing, grade_types are the students' grade types used with the pass_threshold_map."""
+        scores = np.asarray(scores, dtype=float)
+        if grade_types is None:
+            return scores >= self.get_pass_threshold()
+        return scores >= self.get_pass_thresholds(grade_types)
 
     def relative_bin(self, score:float, max_score:float) -> bin:
         if self.normal_max_points is None:
@@ -171,10 +250,11 @@ class GradeBins:
         if max_score == 0:
             max_score = 1
         ratio = score / max_score
-        for b in self.bins.values():
-            if b.in_relative_bin(ratio, self.normal_max_points):
-                return b
-        return None
+        return self.in_bin(ratio * self.normal_max_points)
+
+    def relative_bin_many(self, scores: np.ndarray, max_score: float) -> np.ndarray:
+        """Returns the id of the relative bin (see :meth:`relative_bin`) of each score."""
+        return self.in_bin_many(self.relative_score_many(scores, max_score))
 
     def relative_score(self, score: float, max_score: float) -> float:
         if self.normal_max_points is None:
@@ -183,12 +263,20 @@ class GradeBins:
             max_score = 1
         return (score / max_score) * self.normal_max_points
 
+    def relative_score_many(self, scores: np.ndarray, max_score: float) -> np.ndarray:
+        if self.normal_max_points is None:
+            raise GradeBinsError("There is no max score set!")
+        if max_score == 0:
+            max_score = 1
+        return (np.asarray(scores, dtype=float) / max_score) * self.normal_max_points
+
     def increment_A_plus(self, amt: float=1) -> bool:
         if "A+" in self.bins and "A" in self.bins:
             APlus = self.bins["A+"]
             A = self.bins["A"]
             APlus.min += amt
             A.max += amt
+            self.invalidate_cache()
             return True
         return False
 
@@ -21,18 +21,33 @@ class Group(Assignment):
             raise ValueError(f"Group already contains the assignment: {assignment}")
         self.assignments.append(assignment)
 
-    def load(self):
+    def get_parent_group(self, assignment: Assignment):
+        """Returns this group if it (or one of its sub groups) contains the assignment."""
+        for a in self.assignments:
+            if a is assignment:
+                return self
+            if isinstance(a, Group) and a.get_parent_group(assignment) is not None:
+                return self
+        return None
+
+    def reset_data(self):
+        super().reset_data()
+        for assignment in self.assignments:
+            assignment.reset_data()
+
+    def load(self, bulk: bool=None):
         tmp = f": {self.name}" if self.name is not None else ""
         load_str = f"Loading group {self.id}{tmp}..."
         load_str_done = load_str + "Done!"
         print(load_str)
         for assignment in self.assignments:
-            assignment.load()
+            assignment.load(bulk=bulk)
             self.data_loaded = self.data_loaded or assignment.data_loaded
 
         seen_students = set()
 
         for assignment in self.assignments:
+            assignment.materialize_data()
             scores = assignment.data.values()
             for _score in scores:
                 if not isinstance(_score, list):
@@ -65,29 +80,10 @@ class Group(Assignment):
 
                     new_sad.personal_comment = group_msg + new_sad.personal_comment
 
-                    dat = self.data.get(sid)
-                    if dat is None:
-                        self.data[sid] = new_sad
-                    else:
-                        if isinstance(dat, list):
-                            dat.append(new_sad)
-                        else:
-                            self.data[sid] = [dat, new_sad]
-                    if sid in self.data:
-                        if isinstance(self.data[sid], list):
-                            self.data[sid].append(new_sad)
-
-                    edat = self.edata.get(email)
-                    if edat is None:
-                        self.edata[email] = new_sad
-                    else:
-                        if isinstance(email, list):
-                            edat.append(new_sad)
-                        else:
-                            self.edata[email] = [edat, new_sad]
-                    if email in self.edata:
-                        if isinstance(self.edata[email], list):
-                            self.edata[email].append(new_sad)
+                    self.insert_sid_data(sid, new_sad)
+                    self.insert_email_data(email, new_sad)
+        self.invalidate_scores_cache()
+        self.invalidate_cache()
         
         print(load_str_done)
 
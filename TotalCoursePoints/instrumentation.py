@@ -0,0 +1,151 @@
+"""
+This records how long the processing stages take and how often the hot calls happen.
+"""
+from __future__ import annotations
+import contextlib
+import json
+import threading
+import time
+
+# The running Instrumentation, None when it is disabled. The hot paths only check this before recording anything.
+active = None
+
+NULL_SPAN = contextlib.nullcontext()
+
+class Instrumentation:
+    """
+    Records timing spans and counters while it is running (see :meth:`start` or use it as a context manager).
+
+        with Instrumentation(profile=True) as inst:
+            c.process()
+        inst.dump_json("process.json")
+
+    The spans are the stages of :meth:`Classroom.process` and every assignment load. The counters include the
+    total points and course points computations, the slip allocations evaluated and the gsheet requests and retries.
+    If profile is True, the run is also captured with cProfile. If trace_memory is True, every span records
+    the peak python allocation (with tracemalloc, or only its growth before python 3.9) which makes the run slower.
+    When no Instrumentation is running, the hooks only cost a None check.
+    """
+    def __init__(self, profile: bool=False, trace_memory: bool=False):
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.spans = []
+        self.counters = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.profiler = None
+        self.started = None
+        self.duration = None
+
+    def start(self):
+        global active
+        if active is not None:
+            raise ValueError("Another Instrumentation is already running!")
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.profile:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self.started = time.perf_counter()
+        active = self
+
+    def stop(self):
+        global active
+        if active is self:
+            active = None
+        self.duration = time.perf_counter() - self.started
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.stop()
+
+    def __enter__(self) -> Instrumentation:
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def count(self, name: str, value: float=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes):
+        depth = getattr(self.local, "depth", 0)
+        self.local.depth = depth + 1
+        if self.trace_memory:
+            import tracemalloc
+            # reset_peak was added in python 3.9, before that only the growth of the traced memory is recorded.
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            memory_start = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.local.depth = depth
+            record = {
+                "name": name,
+                "start": start - self.started,
+                "duration": end - start,
+                "depth": depth,
+                "thread": threading.current_thread().name,
+            }
+            if attributes:
+                record["attributes"] = attributes
+            if self.trace_memory:
+                import tracemalloc
+                current, peak = tracemalloc.get_traced_memory()
+                if hasattr(tracemalloc, "reset_peak"):
+                    record["peak_memory"] = peak
+                else:
+                    record["memory_delta"] = current - memory_start
+            with self.lock:
+                self.spans.append(record)
+
+    def get_stage_totals(self) -> dict:
+        """Returns the total duration of the spans of each name."""
+        totals = {}
+        for s in self.spans:
+            totals[s["name"]] = totals.get(s["name"], 0) + s["duration"]
+        return totals
+
+    def get_profile_stats(self, sort: str="cumulative", limit: int=30) -> str:
+        """Returns the top of the cProfile report (if profile was enabled)."""
+        if self.profiler is None:
+            return ""
+        import io
+        import pstats
+        out = io.StringIO()
+        pstats.Stats(self.profiler, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def to_dict(self) -> dict:
+        with self.lock:
+            return {
+                "duration": self.duration,
+                "spans": sorted(self.spans, key=lambda s: s["start"]),
+                "counters": dict(self.counters),
+                "stage_totals": self.get_stage_totals(),
+            }
+
+    def dump_json(self, dest: str):
+        with open(dest, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        if self.profiler is not None:
+            self.profiler.dump_stats(dest + ".prof")
+
+def span(name: str, **attributes):
+    """Returns a timing span of the running Instrumentation or a no-op context manager when there is none."""
+    if active is None:
+        return NULL_SPAN
+    return active.span(name, **attributes)
+
+def count(name: str, value: float=1):
+    if active is not None:
+        active.count(name, value)
@@ -0,0 +1,171 @@
+"""
+This is a columnar (students x assignments) view of the classroom's scores.
+"""
+from __future__ import annotations
+import numpy as np
+from .grade_bins import PNP
+from .utils import Time
+
+def time_to_seconds(t) -> float:
+    """Returns the number of seconds in t which can be a Time or a raw number of seconds."""
+    if isinstance(t, Time):
+        return t.get_seconds()
+    if t is None:
+        return 0
+    return t
+
+class ScoreMatrix:
+    """A students x assignments matrix of the classroom's processed data.
+
+    The matrix is built from the student objects once the classroom has been processed
+    (matched, extended, slipped and dropped). Every class wide aggregate (totals, grades,
+    ranks and statistics) can then be computed with array operations instead of walking
+    the object graph once per student. The object API stays the source of truth: the classroom
+    drops its matrix in :meth:`Classroom.invalidate_cache` and rebuilds it when it is next needed,
+    so call that (or :meth:`refresh`) after mutating any student data directly.
+
+    :param c: The processed classroom.
+    :type c: class:`TotalCoursePoints.Classroom`
+    """
+    def __init__(self, c: "Classroom"):
+        self.classroom = c
+        self.refresh()
+
+    def refresh(self):
+        c = self.classroom
+        self.students = list(c.students)
+        self.categories = list(c.categories.values())
+        self.assignments = []
+        self.assignment_category = []
+        for ci, cat in enumerate(self.categories):
+            for a in cat.assignments:
+                self.assignments.append(a)
+                self.assignment_category.append(ci)
+        self.assignment_category = np.array(self.assignment_category, dtype=np.int64)
+        self.student_index = {s: i for i, s in enumerate(self.students)}
+        self.assignment_index = {a: j for j, a in enumerate(self.assignments)}
+
+        n = len(self.students)
+        m = len(self.assignments)
+        self.raw_scores = np.zeros((n, m))
+        self.late_seconds = np.zeros((n, m))
+        self.extension_seconds = np.zeros((n, m))
+        self.slip_used = np.zeros((n, m), dtype=np.int64)
+        self.dropped = np.zeros((n, m), dtype=bool)
+        self.hidden = np.zeros((n, m), dtype=bool)
+        # Cells whose data cannot be described by their column's assignment policy
+        # (ex. a group's merged data or a per student late interval) use the object path.
+        self.use_object = np.zeros((n, m), dtype=bool)
+        self.assignments_data = np.empty((n, m), dtype=object)
+
+        self.category_override = np.full((n, len(self.categories)), np.nan)
+        self.student_override = np.full(n, np.nan)
+        self.active = np.zeros(n, dtype=bool)
+        self.for_grade = np.zeros(n, dtype=bool)
+        self.incomplete = np.zeros(n, dtype=bool)
+        self.grade_status = []
+        # Data created with another policy (e.g. merged group data) can not use the assignment's vectorized course points.
+        policies = [a.get_policy() for a in self.assignments]
+
+        for i, student in enumerate(self.students):
+            self.active[i] = student.active_student
+            self.for_grade[i] = student.is_for_grade()
+            self.incomplete[i] = student.incomplete
+            self.grade_status.append(student.grade_status)
+            if student.override_score is not None:
+                self.student_override[i] = student.override_score
+            for ci, cat in enumerate(self.categories):
+                cat_data = student.categoryData.get(cat.name)
+                if cat_data is None:
+                    raise ValueError(f"Student {student.name} ({student.sid}) does not have data for category {cat.name}! Has the classroom been processed?")
+                if cat_data.override_score is not None:
+                    self.category_override[i, ci] = cat_data.override_score
+                for sad in cat_data.assignments_data:
+                    j = self.assignment_index[sad.assignment]
+                    self.assignments_data[i, j] = sad
+                    self.raw_scores[i, j] = sad.score
+                    self.late_seconds[i, j] = time_to_seconds(sad.time_late)
+                    self.extension_seconds[i, j] = time_to_seconds(sad.extension_time)
+                    self.slip_used[i, j] = sad.slip_time_used
+                    self.dropped[i, j] = sad.dropped
+                    self.hidden[i, j] = sad.is_hidden()
+                    self.use_object[i, j] = sad.late_interval is not None or sad.policy is not policies[j]
+        self.course_points = None
+
+    def get_student_index(self, s: "Student") -> int:
+        return self.student_index.get(s)
+
+    def get_course_points(self) -> np.ndarray:
+        """Returns the students x assignments matrix of course points."""
+        if self.course_points is None:
+            cp = np.zeros(self.raw_scores.shape)
+            for j in range(len(self.assignments)):
+                cp[:, j] = self.assignments[j].get_course_points_many(
+                    self.raw_scores[:, j],
+                    late_seconds=self.late_seconds[:, j],
+                    extension_seconds=self.extension_seconds[:, j],
+                    slip_counts=self.slip_used[:, j],
+                    dropped=self.dropped[:, j]
+                )
+            for i, j in zip(*np.nonzero(self.use_object)):
+                cp[i, j] = self.assignments_data[i, j].get_course_points()
+            self.course_points = cp
+        return self.course_points
+
+    def get_category_totals(self, with_hidden=False) -> np.ndarray:
+        """Returns the students x categories matrix of category totals.
+        The columns are accumulated in assignment order so the totals match the object path exactly."""
+        cp = self.get_course_points()
+        totals = np.zeros((len(self.students), len(self.categories)))
+        for j in range(len(self.assignments)):
+            ci = self.assignment_category[j]
+            col = cp[:, j]
+            if not with_hidden:
+                col = np.where(self.hidden[:, j], 0, col)
+            totals[:, ci] += col
+        for ci, cat in enumerate(self.categories):
+            if cat.does_not_contribute:
+                totals[:, ci] = 0
+                continue
+            override = self.category_override[:, ci]
+            totals[:, ci] = np.where(np.isnan(override), totals[:, ci], override)
+        return totals
+
+    def get_totals(self, with_hidden=False) -> np.ndarray:
+        """Returns every student's total points (see :meth:`Student.total_points`)."""
+        cat_totals = self.get_category_totals(with_hidden=with_hidden)
+        ignore_categories = self.classroom.get_ignore_category()
+        totals = np.zeros(len(self.students))
+        for ci, cat in enumerate(self.categories):
+            if cat.name in ignore_categories:
+                continue
+            totals += cat_totals[:, ci]
+        return np.where(np.isnan(self.student_override), totals, self.student_override)
+
+    def get_total_points_with_class(self, with_hidden=False) -> np.ndarray:
+        """Returns every student's total points including the classroom's raw additional points."""
+        c = self.classroom
+        tp = c.get_total_possible()
+        if tp == 0:
+            tp = 1
+        return self.get_totals(with_hidden=with_hidden) + (c.get_raw_additional_pts() * (c.get_total_possible(only_inputted=True) / tp))
+
+    def get_grade_ids(self, with_hidden=False, ignore_pnp=False, approx=False) -> list:
+        """Returns every student's grade id (see :meth:`Student.get_grade` and :meth:`Student.get_approx_grade_id`)."""
+        c = self.classroom
+        gb = c.grade_bins
+        scores = self.get_total_points_with_class(with_hidden=with_hidden)
+        if approx:
+            cur_max_score = c.get_total_possible(only_inputted=True)
+            scores = gb.relative_score_many(scores, cur_max_score)
+        grades = gb.in_bin_many(scores)
+        if not ignore_pnp:
+            pnp_rows = [i for i, status in enumerate(self.grade_status) if not self.for_grade[i] and status in PNP.PNP_Types]
+            if pnp_rows:
+                statuses = [self.grade_status[i] for i in pnp_rows]
+                passing = gb.is_passing_many(scores[pnp_rows], statuses)
+                for i, status, passed in zip(pnp_rows, statuses, passing.tolist()):
+                    pnp = PNP.PNP_Types[status]
+                    grades[i] = pnp.pass_value if passed else pnp.not_pass_value
+        grades[self.incomplete] = "I"
+        return grades.tolist()
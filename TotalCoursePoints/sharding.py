@@ -0,0 +1,140 @@
+"""
+This runs the per student processing stages (slip time and dropping) in a process pool.
+"""
+from __future__ import annotations
+import copy
+import math
+from concurrent.futures import ProcessPoolExecutor
+from .category import StudentCategoryData
+from .assignment import StudentAssignmentData
+from .group import Group
+
+class ProcessingCopies:
+    """
+    Copies of the classroom's categories and assignments without any of the loaded data.
+    They only carry the grading policies, which is all the slip time and dropping stages need,
+    so they are cheap to send to the worker processes.
+    """
+    def __init__(self, categories: list):
+        self.categories = []
+        self.assignments = []
+        self.category_copies = {}
+        self.assignment_index = {}
+        self.category_index = {}
+        for cat in categories:
+            self.category_index[cat] = len(self.categories)
+            self.categories.append(self.get_category_copy(cat))
+
+    def get_category_copy(self, cat: Category) -> Category:
+        cat_copy = self.category_copies.get(cat)
+        if cat_copy is None:
+            cat_copy = copy.copy(cat)
+            cat_copy.cache = {}
+            self.category_copies[cat] = cat_copy
+            cat_copy.assignments = [self.get_assignment_copy(a) for a in cat.assignments]
+        return cat_copy
+
+    def get_assignment_index(self, assignment: Assignment) -> int:
+        idx = self.assignment_index.get(assignment)
+        if idx is None:
+            self.get_assignment_copy(assignment)
+            idx = self.assignment_index[assignment]
+        return idx
+
+    def get_assignment_copy(self, assignment: Assignment) -> Assignment:
+        idx = self.assignment_index.get(assignment)
+        if idx is not None:
+            return self.assignments[idx]
+        a_copy = copy.copy(assignment)
+        self.assignment_index[assignment] = len(self.assignments)
+        self.assignments.append(a_copy)
+        a_copy.data = {}
+        a_copy.edata = {}
+        a_copy.pending_columns = []
+        a_copy.policy_cache = None
+        a_copy.scores = []
+        a_copy.all_scores = []
+        a_copy.invalidate_scores_cache()
+        if isinstance(a_copy, Group):
+            a_copy.assignments = []
+            a_copy.score_merger = None
+        a_copy.category = self.get_category_copy(assignment.category)
+        return a_copy
+
+    def serialize_student(self, student: Student) -> list:
+        """Returns the compact form of the student's data for every category."""
+        data = []
+        for cat_data in student.categoryData.values():
+            sads = []
+            for sad in cat_data.assignments_data:
+                sads.append((
+                    self.get_assignment_index(sad.assignment),
+                    # Merged group data keeps the policy of the assignment it was created with.
+                    self.get_assignment_index(sad.policy.assignment),
+                    sad.score,
+                    sad.time_late,
+                    sad.slip_time_used,
+                    sad.extension_time,
+                    sad.data_loaded,
+                    sad.data_found,
+                    sad.dropped,
+                    sad.hidden,
+                    sad.late_interval,
+                ))
+            data.append((self.category_index[cat_data.category], cat_data.override_score, sads))
+        return data
+
+_worker_copies = None
+
+def _init_worker(categories: list, assignments: list):
+    global _worker_copies
+    _worker_copies = (categories, assignments)
+
+def process_students(categories: list, assignments: list, students: list) -> list:
+    """
+    Applies the slip time and drops the lowest assignments of serialized students.
+    categories and assignments are the copies of :class:`ProcessingCopies` the students were serialized with.
+    Returns the (slip time used, dropped, appended comment) of every assignment data.
+    """
+    results = []
+    for student in students:
+        cat_results = []
+        for cat_idx, override_score, sads in student:
+            assignments_data = []
+            for a_idx, policy_idx, score, time_late, slip_time_used, extension_time, data_loaded, data_found, dropped, hidden, late_interval in sads:
+                sad = StudentAssignmentData(score, time_late, None, None, None, assignments[policy_idx], slip_time_used=slip_time_used, extension_time=extension_time, data_loaded=data_loaded, data_found=data_found, dropped=dropped, hidden=hidden, late_interval=late_interval)
+                sad.assignment = assignments[a_idx]
+                assignments_data.append(sad)
+            cat_data = StudentCategoryData(categories[cat_idx], assignments_data)
+            cat_data.override_score = override_score
+            cat_data.apply_slip_time()
+            cat_data.drop_lowest_assignments()
+            cat_results.append([(sad.slip_time_used, sad.dropped, sad.get_comment()) for sad in assignments_data])
+        results.append(cat_results)
+    return results
+
+def _process_shard(students: list) -> list:
+    return process_students(*_worker_copies, students)
+
+def apply_slip_time_and_drop_sharded(c: "Classroom", workers: int, shard_size: int=None):
+    """
+    Runs the slip time and drop lowest stages of every student of the classroom in a process pool
+    and merges the results back into the students' data. The students are split in chunks of shard_size.
+    """
+    copies = ProcessingCopies(list(c.categories.values()))
+    students = c.students
+    serialized = [copies.serialize_student(s) for s in students]
+    if shard_size is None:
+        shard_size = max(1, math.ceil(len(students) / (workers * 4)))
+    shards = [serialized[i:i + shard_size] for i in range(0, len(serialized), shard_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(copies.categories, copies.assignments)) as executor:
+        shard_results = list(executor.map(_process_shard, shards))
+    i = 0
+    for results in shard_results:
+        for cat_results in results:
+            for cat_data, sad_results in zip(students[i].categoryData.values(), cat_results):
+                for sad, (slip_time_used, dropped, comment) in zip(cat_data.assignments_data, sad_results):
+                    sad.slip_time_used = slip_time_used
+                    sad.dropped = dropped
+                    sad.personal_comment += comment
+            i += 1
@@ -4,6 +4,7 @@ This is a class which will contain info about the current student.
 from __future__ import annotations
 import json
 from . import GradeBins, PNP
+from . import instrumentation
 from typing import Union
 
 class Student:
@@ -68,6 +69,8 @@ class Student:
         self.categoryData[data.category.name] = data
 
     def total_points(self, with_hidden=False, c=None):
+        if instrumentation.active is not None:
+            instrumentation.active.count("total_points")
         if self.override_score is not None:
             return self.override_score
         ignore_categories = set([])
@@ -84,7 +87,7 @@ class Student:
         cat = self.categoryData.get(assignment.category.name)
         if cat is None:
             return None
-        return cat.get_assignment_data(assignment)
+        return cat.get_assignment_data(assignment.id)
         # for a in cat:
         #     if a.assignment == assignment:
         #         return a
@@ -142,8 +145,11 @@ class Student:
         b = c.grade_bins.relative_bin(cur_score, cur_max_score)
         return f"You are on track for a(n) {b.id} based off of the {cur_max_score} points entered."
 
-    def apply_extensions(self):
+    def apply_extensions(self, categories: list=None):
+        """Applies the extensions of the student. If categories is given, only those categories (names) are updated."""
         for ext_cat_key, value in self.extensionData.items():
+            if categories is not None and ext_cat_key not in categories:
+                continue
             cat = self.categoryData.get(ext_cat_key)
             if cat is None:
                 continue
@@ -179,7 +185,12 @@ class Student:
         with open(results_file, "w") as f:
             f.write(jsondata)
 
-    def dump_str(self, c, class_dist: bool=False, class_stats_all: bool=False, class_stats_graded: bool=False, include_rank=False):
+    def dump_str(self, c, class_dist: bool=False, class_stats_all: bool=False, class_stats_graded: bool=False, include_rank=False, class_stats_str: str=None):
+        """
+        Generates the Gradescope results for this student.
+        class_stats_str can be given to reuse the class wide statistics (see :meth:`Classroom.get_class_stats_results_str`)
+        instead of recomputing them for every student.
+        """
         tests = []
         results = {
             "score":self.get_total_points_with_class(c),
@@ -192,22 +203,9 @@ class Student:
             }
         tests.append({"name":"Total", "output": self.main_results_str(c, include_rank=include_rank)})
         if class_dist or class_stats_all or class_stats_graded:
-            stats_str = ""
-            if class_stats_graded:
-                title = "Class Statistics (Graded):"
-                stats_str += f"{title}\n" + ("-" * len(title)) + "\n"
-                stats_str += c.get_class_points_stats_str()
-                stats_str += "\n"
-            if class_stats_all:
-                title = "Class Statistics (All):"
-                stats_str += f"{title}\n" + ("-" * len(title)) + "\n"
-                stats_str += c.get_class_points_stats_str(only_for_grade=False)
-                stats_str += "\n"
-            if class_dist:
-                if class_stats_all or class_stats_graded:
-                    stats_str += ("_" * 35) + ("\n" * 2)
-                stats_str += c.get_class_statistics_str()
-            tests.append({"name": "Class Stats", "output": stats_str})
+            if class_stats_str is None:
+                class_stats_str = c.get_class_stats_results_str(class_dist=class_dist, class_stats_all=class_stats_all, class_stats_graded=class_stats_graded)
+            tests.append({"name": "Class Stats", "output": class_stats_str})
         for cat in self.categoryData.values():
             if not cat.is_hidden():
                 score = cat.get_total_score(ignore_not_for_points=True)
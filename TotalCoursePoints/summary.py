@@ -0,0 +1,144 @@
+"""
+This stores the class wide values needed to render a single student's results.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import numpy as np
+
+SUMMARY_FORMAT_VERSION = 1
+META_KEY = "meta"
+VALUE_ARRAY_PREFIX = "value/"
+ASSIGNMENT_ARRAY_PREFIX = "assignment/"
+
+RANKING = "ranking"
+GRADE_BINS_COUNT = "grade_bins_count"
+POINTS_STATS = "points_stats"
+
+def get_assignment_key(assignment: "Assignment") -> str:
+    return f"{assignment.category.name}/{assignment.id}"
+
+def get_input_hash(c: "Classroom") -> str:
+    """
+    Returns a hash of everything the summary is computed from: the assignment data files, the roster and the grading options.
+    Assignments loaded from a gsheet are only hashed by their key and the extensions are not hashed (applying them changes
+    the students' extension data), so changes to those are not detected.
+    """
+    h = hashlib.sha256()
+    def add(*values):
+        h.update(json.dumps(values, default=str).encode())
+        h.update(b"\0")
+    add(SUMMARY_FORMAT_VERSION, str(c.grade_bins), c.get_raw_additional_pts(), sorted(c.get_ignore_category()))
+    for cat in c.categories.values():
+        for a in cat.assignments:
+            add(get_assignment_key(a), a.gsheets_grades)
+            if a.data_file is not None and os.path.isfile(a.data_file):
+                with open(a.data_file, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        h.update(chunk)
+            else:
+                add(None)
+    for student in c.students:
+        add(student.sid, student.active_student, student.grade_status, student.incomplete)
+    return h.hexdigest()
+
+class AssignmentSummary:
+    """The sorted scores and the stats of an assignment (of the scores used for the ranks, see :meth:`Assignment.get_rank`)."""
+    def __init__(self, sorted_scores: np.ndarray, stats: tuple):
+        self.sorted_scores = sorted_scores
+        self.stats = stats
+
+class ClassSummary:
+    """
+    The class wide values used when rendering a student's results: the ranking, the class statistics,
+    the grade distribution, the total possible points and the scores and stats of every assignment.
+    Create it with :meth:`from_classroom` after processing the whole class, then :meth:`Classroom.process_for_student`
+    can render a single student without processing everyone else.
+    """
+    def __init__(self, values: dict=None, assignments: dict=None, input_hash: str=None):
+        self.values = {} if values is None else values
+        self.assignments = {} if assignments is None else assignments
+        self.input_hash = input_hash
+
+    def get(self, key: tuple):
+        return self.values.get(key)
+
+    def get_assignment(self, assignment: "Assignment") -> AssignmentSummary:
+        return self.assignments.get(get_assignment_key(assignment))
+
+    @classmethod
+    def from_classroom(cls, c: "Classroom") -> ClassSummary:
+        """Computes the summary of a processed classroom (with the arguments the students' results use)."""
+        if c.class_summary is not None:
+            raise ValueError("The classroom is already using a class summary!")
+        values = {}
+        values[(RANKING, True, False)] = c.get_ranking_index()
+        for only_for_grade in [True, False]:
+            values[(POINTS_STATS, False, True, True, only_for_grade)] = c.get_class_points_stats_str(only_for_grade=only_for_grade)
+        values[(GRADE_BINS_COUNT, False, False, True, False)] = c.get_grade_bins_count()
+        for with_hidden in [False, True]:
+            values[("all_inputted", with_hidden)] = c.all_inputted(with_hidden=with_hidden)
+            for only_inputted in [False, True]:
+                values[("total_possible", with_hidden, only_inputted)] = c.get_total_possible(with_hidden=with_hidden, only_inputted=only_inputted)
+        assignments = {}
+        for cat in c.categories.values():
+            for a in cat.assignments:
+                assignments[get_assignment_key(a)] = AssignmentSummary(a.get_sorted_scores(), a.get_stats())
+        return cls(values, assignments, input_hash=get_input_hash(c))
+
+    def is_fresh(self, c: "Classroom") -> bool:
+        """Returns if the summary was computed from the same inputs as the classroom has now (see :func:`get_input_hash`)."""
+        return self.input_hash is not None and self.input_hash == get_input_hash(c)
+
+    def save(self, dest: str):
+        """
+        Writes the summary to dest as a versioned .npz file. The arrays are stored as is and the other values
+        (grade distribution, stats strings, total possible, ...) as json in the meta entry.
+        """
+        arrays = {}
+        values = []
+        for i, (key, value) in enumerate(self.values.items()):
+            if isinstance(value, np.ndarray):
+                name = f"{VALUE_ARRAY_PREFIX}{i}"
+                arrays[name] = value
+                values.append({"key": list(key), "array": name})
+            else:
+                values.append({"key": list(key), "value": value})
+        assignments = {}
+        for i, (key, a) in enumerate(self.assignments.items()):
+            name = f"{ASSIGNMENT_ARRAY_PREFIX}{i}"
+            arrays[name] = np.asarray(a.sorted_scores, dtype=float)
+            assignments[key] = {"array": name, "stats": [v.item() if isinstance(v, np.generic) else v for v in a.stats]}
+        meta = {
+            "version": SUMMARY_FORMAT_VERSION,
+            "input_hash": self.input_hash,
+            "values": values,
+            "assignments": assignments,
+        }
+        arrays[META_KEY] = np.array(json.dumps(meta, default=float))
+        tmp = dest + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, dest)
+
+    @classmethod
+    def load(cls, src: str, c: "Classroom"=None) -> ClassSummary:
+        """
+        Reads a summary written by :meth:`save`.
+        If c is given, raises a ValueError when the summary is stale (see :meth:`is_fresh`).
+        """
+        with np.load(src, allow_pickle=False) as data:
+            meta = json.loads(str(data[META_KEY]))
+            if meta.get("version") != SUMMARY_FORMAT_VERSION:
+                raise ValueError(f"The class summary {src} has version {meta.get('version')} but version {SUMMARY_FORMAT_VERSION} is required!")
+            values = {}
+            for entry in meta["values"]:
+                values[tuple(entry["key"])] = data[entry["array"]] if "array" in entry else entry["value"]
+            assignments = {}
+            for key, entry in meta["assignments"].items():
+                assignments[key] = AssignmentSummary(data[entry["array"]], tuple(entry["stats"]))
+        summary = cls(values, assignments, input_hash=meta.get("input_hash"))
+        if c is not None and not summary.is_fresh(c):
+            raise ValueError(f"The class summary {src} is stale, the classroom's input data has changed since it was created!")
+        return summary
@@ -4,94 +4,359 @@ from time import sleep
 import json
 from oauth2client.service_account import ServiceAccountCredentials
 import math
+import itertools
+import random
+import threading
+from time import monotonic
 from collections import OrderedDict
-
-# we want to wait 10 seconds before we try to do the request.
-gspread_timeout = 10
-# <= 0 means we will try till success. otherwise a positive value.
+from concurrent.futures import Future, ThreadPoolExecutor
+from . import instrumentation
+
+# the first retry waits about this many seconds, the wait doubles after every failure up to gspread_max_backoff.
+gspread_timeout = 1
+gspread_max_backoff = 64
+# The number of times a call backs off once every account's quota is exhausted before giving up.
+# <= 0 means we will try till success. otherwise a positive value. These are read when a call is made.
 gspread_attempts = 500
+# The Sheets API allows 60 read requests per minute for each service account.
+gsheet_requests_per_minute = 60
 
 RESOURCE_EXHAUSTED = "RESOURCE_EXHAUSTED"
 
+def is_resource_exhausted(e: APIError) -> bool:
+    """Returns if the request was rejected because the quota was exhausted (HTTP 429)."""
+    try:
+        if e.response.status_code == 429:
+            return True
+    except AttributeError:
+        pass
+    try:
+        return json.loads(e.response.text)["error"]["status"] == RESOURCE_EXHAUSTED
+    except Exception:
+        return False
+
+def get_backoff(failures: int, sleep_timeout: float=None, max_backoff: float=None) -> float:
+    """Returns the exponential backoff after the given number of failures, half of it is random jitter."""
+    if sleep_timeout is None:
+        sleep_timeout = gspread_timeout
+    if max_backoff is None:
+        max_backoff = gspread_max_backoff
+    delay = min(max_backoff, sleep_timeout * (2 ** max(0, failures - 1)))
+    return delay / 2 + random.uniform(0, delay / 2)
+
 # fn is the function you want to call
 # args is a LIST Of args you want to put in.
 # kwargs is a DICT of named args you want to put in.
 # 
-def safe_gspread_call(fn, args=[], kwargs={}, sleep_timeout=gspread_timeout, attempts=gspread_attempts):
+def safe_gspread_call(fn, args=[], kwargs={}, sleep_timeout=None, attempts=None):
+    if attempts is None:
+        attempts = gspread_attempts
     i = 0
     cond = lambda: attempts <= 0 or i < attempts
     while cond():
+        instrumentation.count("gsheet_requests")
         try:
-            return fn(*args, *kwargs)
+            return fn(*args, **kwargs)
         except APIError as e:
-            try:
-                if not json.loads(e.response.text)["error"]["status"] == RESOURCE_EXHAUSTED:
-                    raise e
-            except Exception:
-                raise e
+            if not is_resource_exhausted(e):
+                raise
+        instrumentation.count("gsheet_retries")
         i += 1
-        print(f"The resources have been exhausted (attempt: {i - 1})!" + (f" Retrying in {sleep_timeout} seconds..." if cond() else ""))
+        delay = get_backoff(i, sleep_timeout)
+        print(f"The resources have been exhausted (attempt: {i - 1})!" + (f" Retrying in {delay:.1f} seconds..." if cond() else ""))
         if cond():
-            sleep(sleep_timeout)
+            sleep(delay)
     print("Failed to grab resource!")
 
+class Clock:
+    """
+    The time source of the rate limiting: now() returns monotonic seconds and sleep() waits.
+    Pass another one to :class:`GSheetClientPool` to control time (ex. a fake clock whose sleep advances now when testing).
+    """
+    def now(self) -> float:
+        return monotonic()
+
+    def sleep(self, seconds: float):
+        sleep(seconds)
+
+class TokenBucket:
+    """
+    The request budget of a service account: it holds up to capacity tokens and refills rate tokens per second.
+    Every request takes a token.
+    """
+    def __init__(self, capacity: float, rate: float, clock: Clock=None):
+        if clock is None:
+            clock = Clock()
+        self.capacity = capacity
+        self.rate = rate
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock.now()
+        self.lock = threading.Lock()
+
+    def refill(self):
+        now = self.clock.now()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self) -> float:
+        with self.lock:
+            self.refill()
+            return self.tokens
+
+    def try_acquire(self) -> bool:
+        with self.lock:
+            self.refill()
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def get_wait_time(self) -> float:
+        """Returns the number of seconds until a token is available."""
+        with self.lock:
+            self.refill()
+            return max(0, (1 - self.tokens) / self.rate)
+
+    def drain(self):
+        """Empties the bucket, this is used when the quota turns out to be exhausted."""
+        with self.lock:
+            self.refill()
+            self.tokens = min(self.tokens, 0)
+
 class ResourceExhaustedError(Exception):
     pass
 
+GSHEET_SCOPE = ['https://spreadsheets.google.com/feeds','https://www.googleapis.com/auth/drive']
+
+def authorize_client(credentials: str):
+    """Returns an authorized gspread client for the service account credentials file."""
+    return gspread.authorize(ServiceAccountCredentials.from_json_keyfile_name(credentials, GSHEET_SCOPE))
+
+def parse_sheet_values(data) -> dict:
+    """Returns the records of every sheet of a values_batch_get response indexed by the sheet name."""
+    all_sheets = {}
+    for sheet in data["valueRanges"]:
+        sheet_name = sheet["range"].split("!")[0]
+        if sheet_name.startswith("'"):
+            sheet_name = sheet_name[1:]
+        if sheet_name.endswith("'"):
+            sheet_name = sheet_name[:-1]
+        
+        ssvalues = sheet["values"]
+
+        keys = ssvalues[0]
+        values = ssvalues[1:]
+
+        all_sheets[sheet_name] = [dict(zip(keys, row)) for row in values]
+    return all_sheets
+
+class GSheetClientPool:
+    """
+    A process wide pool of authorized gspread clients, one per credentials file, shared by every :class:`GSheetCredentialsManager`.
+    Each client opens a spreadsheet once (opening one is a request) and the spreadsheet is reused by the following calls.
+    Opens and fetches of a spreadsheet which is already being opened or fetched wait for it instead of doing it again.
+    client_factory creates the client of a credentials file, replace it to use another backend (ex. a fake gspread when testing).
+    Each credentials file also gets a :class:`TokenBucket` of requests_per_minute requests.
+    clock is used by the buckets and for every wait of the managers (see :class:`Clock`).
+    """
+    def __init__(self, client_factory=authorize_client, requests_per_minute: float=gsheet_requests_per_minute, clock: Clock=None):
+        if clock is None:
+            clock = Clock()
+        self.client_factory = client_factory
+        self.requests_per_minute = requests_per_minute
+        self.clock = clock
+        self.clients = {}
+        self.spreadsheets = {}
+        self.buckets = {}
+        self.managers = {}
+        self.in_flight = {}
+        # Reentrant since a new manager gets its buckets while get_manager holds the lock.
+        self.lock = threading.RLock()
+
+    def get_client(self, credentials: str):
+        with self.lock:
+            client = self.clients.get(credentials)
+            if client is None:
+                client = self.client_factory(credentials)
+                self.clients[credentials] = client
+            return client
+
+    def run_once(self, key, fn):
+        """Returns fn(), but while it runs the calls with the same key wait for its result instead of calling fn."""
+        with self.lock:
+            future = self.in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self.in_flight[key] = future
+        if not owner:
+            return future.result()
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+
+    def open_by_key(self, credentials: str, sheet_key: str):
+        """Returns the spreadsheet opened by the client of credentials, it is only opened the first time."""
+        key = (credentials, sheet_key)
+        with self.lock:
+            spreadsheet = self.spreadsheets.get(key)
+        if spreadsheet is not None:
+            return spreadsheet
+        def open_spreadsheet():
+            spreadsheet = self.get_client(credentials).open_by_key(sheet_key)
+            with self.lock:
+                self.spreadsheets[key] = spreadsheet
+            return spreadsheet
+        return self.run_once(("open",) + key, open_spreadsheet)
+
+    def get_bucket(self, credentials: str) -> TokenBucket:
+        with self.lock:
+            bucket = self.buckets.get(credentials)
+            if bucket is None:
+                bucket = TokenBucket(self.requests_per_minute, self.requests_per_minute / 60, clock=self.clock)
+                self.buckets[credentials] = bucket
+            return bucket
+
+    def get_manager(self, credentials_list: [str]) -> "GSheetCredentialsManager":
+        """Returns the shared credentials manager of the credentials list."""
+        key = tuple(credentials_list)
+        with self.lock:
+            manager = self.managers.get(key)
+            if manager is None:
+                manager = GSheetCredentialsManager(list(key), client_pool=self)
+                self.managers[key] = manager
+            return manager
+
+    def clear(self):
+        with self.lock:
+            self.clients = {}
+            self.spreadsheets = {}
+            self.buckets = {}
+            self.managers = {}
+
+    def fetch_all_sheets(self, sheet_key: str, manager: "GSheetCredentialsManager") -> dict:
+        """Returns the records of every sheet of the spreadsheet (see :meth:`GSheetCredentialsManager.fetch_all_sheets`)."""
+        return self.run_once(("fetch", sheet_key), lambda: manager.fetch_all_sheets(sheet_key))
+
+    def fetch_many(self, sheet_keys: [str], manager: "GSheetCredentialsManager", workers: int=None) -> dict:
+        """
+        Fetches the spreadsheets concurrently, by default with one thread per credentials so every service account is used.
+        Returns the records of every sheet indexed by the sheet key.
+        """
+        sheet_keys = list(dict.fromkeys(sheet_keys))
+        if workers is None:
+            workers = len(manager.credentials_list)
+        workers = max(1, min(workers, len(sheet_keys)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(lambda key: self.fetch_all_sheets(key, manager), sheet_keys)
+            return dict(zip(sheet_keys, results))
+
 class GSheetCredentialsManager:
-    SCOPE = ['https://spreadsheets.google.com/feeds','https://www.googleapis.com/auth/drive']
-    def __init__(self, credentials_list: [str]):
-        self.all_creds = [
-            ServiceAccountCredentials.from_json_keyfile_name(credentials, self.SCOPE) 
-            for credentials in credentials_list
-            ]
-        self.clients = []
-
-    def get_clients(self):
-        for i, cred in enumerate(self.all_creds):
-            if i <= len(self.clients):
-                self.clients.append(gspread.authorize(cred))
-            yield self.clients[i]
-
-    def safe_gspread_call(self, sheet_key, fn_name, args=[], kwargs={}, sleep_timeout=gspread_timeout, attempts=gspread_attempts):
-        i = 0
-        cond = lambda: attempts <= 0 or i < attempts
-        def attempt(fn):
-            raise_error = None
+    """
+    Makes the requests of a list of service accounts. Each request uses the account with the most budget left
+    (see :class:`TokenBucket`) and waits for a token when every account has used its budget.
+    The counters (see :meth:`get_counters`) track the requests, the retries and the time spent waiting.
+    Every wait uses the clock of the client pool.
+    """
+    SCOPE = GSHEET_SCOPE
+    def __init__(self, credentials_list: [str], client_pool: GSheetClientPool=None):
+        if client_pool is None:
+            client_pool = gsheet_client_pool
+        self.credentials_list = list(credentials_list)
+        self.client_pool = client_pool
+        self.clock = client_pool.clock
+        self.buckets = [client_pool.get_bucket(credentials) for credentials in self.credentials_list]
+        # Accounts with the same budget are used in turn so concurrent calls are spread across them.
+        self.next_start = itertools.count()
+        self.counters_lock = threading.Lock()
+        self.counters = {"requests": 0, "retries": 0, "waits": 0, "wait_time": 0, "backoffs": 0, "backoff_time": 0}
+
+    def count(self, name: str, value: float=1):
+        with self.counters_lock:
+            self.counters[name] += value
+        instrumentation.count("gsheet_" + name, value)
+
+    def get_counters(self) -> dict:
+        with self.counters_lock:
+            return dict(self.counters)
+
+    def get_clients(self, start: int=0):
+        count = len(self.credentials_list)
+        for i in range(count):
+            yield self.client_pool.get_client(self.credentials_list[(start + i) % count])
+
+    def acquire(self, start: int=0) -> int:
+        """Takes a token from the account with the most budget left and returns its index, waiting for a token if needed."""
+        count = len(self.buckets)
+        order = [(start + i) % count for i in range(count)]
+        while True:
+            i = max(order, key=lambda j: self.buckets[j].available())
+            if self.buckets[i].try_acquire():
+                return i
+            wait = self.buckets[i].get_wait_time()
+            if wait > 0:
+                self.count("waits")
+                self.count("wait_time", wait)
+                self.clock.sleep(wait)
+
+    def fetch_all_sheets(self, sheet_key: str) -> dict:
+        """Downloads every sheet of the spreadsheet with two requests and returns their records indexed by the sheet name."""
+        meta = self.safe_gspread_call(sheet_key, "fetch_sheet_metadata")
+        ranges = [sheet['properties']['title'] for sheet in meta['sheets']]
+        data = self.safe_gspread_call(sheet_key, "values_batch_get", args=[ranges])
+        return parse_sheet_values(data)
+
+    def safe_gspread_call(self, sheet_key, fn_name, args=[], kwargs={}, sleep_timeout=None, attempts=None):
+        """
+        Calls fn_name of the spreadsheet. When the quota of the account is exhausted, its budget is emptied and the call is
+        retried with another account. Once no account has budget left, it backs off exponentially (see :func:`get_backoff`).
+        attempts is the number of those backoffs before giving up (gspread_attempts by default), <= 0 retries until success.
+        """
+        if attempts is None:
+            attempts = gspread_attempts
+        start = next(self.next_start)
+        failures = 0
+        backoffs = 0
+        cond = lambda: attempts <= 0 or backoffs < attempts
+        while cond():
+            i = self.acquire(start)
+            self.count("requests")
             try:
-                return fn(*args, *kwargs)
+                spreadsheet = self.client_pool.open_by_key(self.credentials_list[i], sheet_key)
+                return getattr(spreadsheet, fn_name)(*args, **kwargs)
             except APIError as e:
-                raise_error = e
-            if raise_error is not None:
-                e: Exception = raise_error
-                raise_resource_error = False
-                try:
-                    if json.loads(e.response.text)["error"]["status"] == RESOURCE_EXHAUSTED:
-                        raise_resource_error = True
-                    else:
-                        raise e
-                except Exception:
-                    raise e
-                if raise_resource_error:
-                    raise ResourceExhaustedError()
-        while cond():
-            j = 0
-            for client in self.get_clients():
-                try:
-                    return attempt(getattr(client.open_by_key(sheet_key), fn_name))
-                except ResourceExhaustedError as e:
-                    print(f"Failed to use client {j}, trying a new one...")
-                j += 1
-            i += 1
-            print(f"The resources have been exhausted (attempt: {i - 1})!" + (f" Retrying in {sleep_timeout} seconds..." if cond() else ""))
-            if cond():
-                sleep(sleep_timeout)
+                if not is_resource_exhausted(e):
+                    raise
+            self.buckets[i].drain()
+            failures += 1
+            self.count("retries")
+            print(f"The resources of client {i} have been exhausted (attempt: {failures - 1})!")
+            if all(bucket.available() < 1 for bucket in self.buckets):
+                backoffs += 1
+                if not cond():
+                    break
+                delay = get_backoff(backoffs, sleep_timeout)
+                print(f"Retrying in {delay:.1f} seconds...")
+                self.count("backoffs")
+                self.count("backoff_time", delay)
+                self.clock.sleep(delay)
         print("Failed to grab resource!")
 
 
 class GSheetBase:
     default_credentials = 'credentials.json'
     default_credentials_list = None
+    client_pool = None
+    # A GSheetCache, the spreadsheets are only downloaded when they are not cached or have changed.
+    sheet_cache = None
     def __init__(self, sheet_key, credentials=None, credentials_manager: GSheetCredentialsManager=None, prefetch=True):
         if credentials is None:
             credentials = self.default_credentials
@@ -99,10 +364,7 @@ class GSheetBase:
         # creds = ServiceAccountCredentials.from_json_keyfile_name(credentials, scope)
         # self.client = gspread.authorize(creds)
         if credentials_manager is None:
-            if self.default_credentials_list is not None:
-                credentials_manager = GSheetCredentialsManager(self.default_credentials_list)
-            else:
-                credentials_manager = GSheetCredentialsManager([credentials])
+            credentials_manager = self.get_default_manager(credentials)
         self.cred_manager = credentials_manager
         # self.sheets = self.client.open_by_key(sheet_key)
         self.sheet_key = sheet_key
@@ -112,32 +374,45 @@ class GSheetBase:
             self.sheet_data = self.fetch_all_sheets()
             print(f"Prefetching google sheet {sheet_key}...Done!")
 
+    @classmethod
+    def get_default_manager(cls, credentials=None) -> GSheetCredentialsManager:
+        """Returns the pooled credentials manager of default_credentials_list (or of credentials if it is not set)."""
+        if credentials is None:
+            credentials = cls.default_credentials
+        if cls.default_credentials_list is not None:
+            return cls.client_pool.get_manager(cls.default_credentials_list)
+        return cls.client_pool.get_manager([credentials])
+
     def fetch_all_sheets(self):
         # meta = safe_gspread_call(self.sheets.fetch_sheet_metadata)
-        meta = self.cred_manager.safe_gspread_call(self.sheet_key, "fetch_sheet_metadata")
-        ranges = [sheet['properties']['title'] for sheet in meta['sheets']]
         # data = safe_gspread_call(self.sheets.values_batch_get, [ranges])
-        data = self.cred_manager.safe_gspread_call(self.sheet_key, "values_batch_get", args=[ranges])
-
-        all_sheets = {}
-
-        for sheet in data["valueRanges"]:
-            sheet_name = sheet["range"].split("!")[0]
-            if sheet_name.startswith("'"):
-                sheet_name = sheet_name[1:]
-            if sheet_name.endswith("'"):
-                sheet_name = sheet_name[:-1]
-            
-            ssvalues = sheet["values"]
-
-            keys = ssvalues[0]
-            values = ssvalues[1:]
-
-            all_sheets[sheet_name] = [dict(zip(keys, row)) for row in values]
+        fetch = lambda: self.client_pool.fetch_all_sheets(self.sheet_key, self.cred_manager)
+        if self.sheet_cache is not None:
+            return self.sheet_cache.load(self.sheet_key, self.cred_manager, fetch)
+        return fetch()
+
+    def load_offline_data(self):
+        """Loads the sheet data from the sheet cache when it is offline since nothing can be fetched on demand."""
+        if self.sheet_data is None and self.sheet_cache is not None and self.sheet_cache.offline:
+            self.sheet_data = self.fetch_all_sheets()
 
-        return all_sheets
+    @classmethod
+    def fetch_many(cls, sheet_keys: [str], workers: int=None, credentials=None) -> dict:
+        """
+        Fetches the spreadsheets concurrently across the service accounts of default_credentials_list
+        (see :meth:`GSheetClientPool.fetch_many`) and returns them indexed by their key.
+        """
+        manager = cls.get_default_manager(credentials)
+        all_data = cls.client_pool.fetch_many(sheet_keys, manager, workers=workers)
+        bases = {}
+        for key, data in all_data.items():
+            base = cls(key, credentials_manager=manager, prefetch=False)
+            base.sheet_data = data
+            bases[key] = base
+        return bases
 
     def get_worksheet_records(self, sheet_name):
+        self.load_offline_data()
         if self.sheet_data is not None:
             if sheet_name not in self.sheet_data:
                 raise ValueError(f"{sheet_name} is not in the spreadsheet!")
@@ -152,6 +427,9 @@ class GSheetBase:
         # return ws.get_all_records()
         return safe_gspread_call(ws.get_all_records)
 
+gsheet_client_pool = GSheetClientPool()
+GSheetBase.client_pool = gsheet_client_pool
+
 class GSheetExtensions(GSheetBase):
     id_column = "sid"
     ignore_columns = [id_column, "name", "Notes"]
@@ -199,6 +477,7 @@ class GSheetExtensions(GSheetBase):
     
     def get_all_extensions(self, process_gsheet_cell=lambda cell: Time(parse=cell)):
         # worksheets = self.sheets.worksheets()
+        self.load_offline_data()
         if self.sheet_data is None:
             worksheets = self.cred_manager.safe_gspread_call(self.sheet_key, "worksheets")
         else:
@@ -227,6 +506,12 @@ def safe_cast(val, to_type, default=None):
         return default
 
 class Time:
+    """
+    A signed amount of time stored as a single number of seconds.
+    The days, hours, minutes and seconds components are derived from it when needed.
+    """
+    __slots__ = ("total_seconds",)
+
     def __init__(self, seconds=0, minutes=0, hours=0, days=0, sign=0, parse=None):
         if parse is not None:
             raise NotImplementedError("Parsing a string to time is not implemented yet!")
@@ -240,23 +525,42 @@ class Time:
             days = 0
         if seconds < 0 or minutes < 0 or hours < 0 or days < 0:
             sign = -1
-        self.sign = sign
-        seconds = abs(seconds)
-        minutes = abs(minutes)
-        hours = abs(hours)
-        days = abs(days)
-        self.seconds = seconds % 60
-        minutes += seconds // 60
-        self.minutes = minutes % 60
-        hours += minutes // 60
-        self.hours = hours % 24
-        self.days = days + hours // 24
+        total = abs(seconds) + 60 * (abs(minutes) + 60 * (abs(hours) + 24 * abs(days)))
+        if isinstance(total, float) and total.is_integer():
+            total = int(total)
+        self.total_seconds = -total if sign < 0 else total
+
+    @classmethod
+    def from_seconds(cls, seconds) -> "Time":
+        t = cls.__new__(cls)
+        t.total_seconds = seconds
+        return t
+
+    @property
+    def sign(self):
+        return -1 if self.total_seconds < 0 else 0
+
+    @property
+    def seconds(self):
+        return abs(self.total_seconds) % 60
+
+    @property
+    def minutes(self):
+        return (abs(self.total_seconds) // 60) % 60
+
+    @property
+    def hours(self):
+        return (abs(self.total_seconds) // 3600) % 24
+
+    @property
+    def days(self):
+        return abs(self.total_seconds) // 86400
     
     def get_seconds(self):
-        return (self.seconds + 60 * (self.minutes + 60 * (self.hours + 24 * (self.days)))) * self.get_sign()
+        return self.total_seconds
 
     def get_sign(self):
-        return -1 if self.sign < 0 else 1
+        return -1 if self.total_seconds < 0 else 1
 
     def ceil_to_days(self) -> int:
         m = self.minutes
@@ -276,29 +580,22 @@ class Time:
         return h
 
     def __sub__(self, other):
-        if isinstance(other, int):
-            return self.get_seconds() - other
         if isinstance(other, Time):
-            t = self.get_seconds() - other.get_seconds()
-            if t < 0:
-                return Time(seconds=t * -1, sign=-1)
-            return Time(seconds=t)
-        import ipdb; ipdb.set_trace()
+            return Time.from_seconds(self.total_seconds - other.total_seconds)
+        if isinstance(other, int):
+            return self.total_seconds - other
         raise NotImplementedError()
 
     def __rsub__(self, other):
-        if isinstance(other, int):
-            return other - self.get_seconds()
         if isinstance(other, Time):
-            t = other.get_seconds() - self.get_seconds()
-            if t < 0:
-                return Time(seconds=t * -1, sign=-1)
-            return Time(seconds=t)
+            return Time.from_seconds(other.total_seconds - self.total_seconds)
+        if isinstance(other, int):
+            return other - self.total_seconds
         raise NotImplementedError()
 
     def __mul__(self, other):
         if isinstance(other, int):
-            return Time(seconds = self.get_seconds() * other)
+            return Time.from_seconds(self.total_seconds * other)
         raise NotImplementedError()
 
     def __rmul__(self, other):
@@ -306,57 +603,58 @@ class Time:
 
 
     def __str__(self):
-        # sign = self.get_sign()
-        # if sign < 0:
-        #     sign = "- "
-        # else:
-        #     sign = " "
-        # return f"{sign}{self.days}-{self.hours}:{self.minutes}:{self.seconds}"
         return self.pretty_time_str()
 
     def __repr__(self):
         return self.__str__()
     
     def get_count(self, interval: "Time"):
-        count = 0
-        if self.get_seconds() == 0:
-            return count
-        late_amt = self
-        while True:
-            count += 1
-            late_amt = late_amt - interval
-            if late_amt.get_seconds() <= 0:
-                return count
-
-    def _compare(self, other, method):
+        """Returns the number of intervals needed to cover this amount of time (ceil division)."""
+        total = self.total_seconds
+        if total == 0:
+            return 0
+        if total < 0:
+            # A negative time counts as a single interval.
+            return 1
+        interval = interval.get_seconds()
+        if interval <= 0:
+            raise ValueError("The interval must be a positive amount of time!")
+        return int(-(-total // interval))
+
+    @staticmethod
+    def _other_seconds(other):
+        if isinstance(other, Time):
+            return other.total_seconds
+        if isinstance(other, int):
+            return other
         try:
-            if isinstance(other, int):
-                seconds = other
-            else:
-                seconds = other.get_seconds()
-            return method(self.get_seconds(), seconds)
+            return other.get_seconds()
         except (AttributeError, TypeError):
-            # _cmpkey not implemented, or return different type,
-            # so I can't compare with "other".
-            return NotImplemented
+            return None
 
     def __lt__(self, other):
-        return self._compare(other, lambda s, o: s < o)
+        o = self._other_seconds(other)
+        return NotImplemented if o is None else self.total_seconds < o
 
     def __le__(self, other):
-        return self._compare(other, lambda s, o: s <= o)
+        o = self._other_seconds(other)
+        return NotImplemented if o is None else self.total_seconds <= o
 
     def __eq__(self, other):
-        return self._compare(other, lambda s, o: s == o)
+        o = self._other_seconds(other)
+        return NotImplemented if o is None else self.total_seconds == o
 
     def __ge__(self, other):
-        return self._compare(other, lambda s, o: s >= o)
+        o = self._other_seconds(other)
+        return NotImplemented if o is None else self.total_seconds >= o
 
     def __gt__(self, other):
-        return self._compare(other, lambda s, o: s > o)
+        o = self._other_seconds(other)
+        return NotImplemented if o is None else self.total_seconds > o
 
     def __ne__(self, other):
-        return self._compare(other, lambda s, o: s != o)
+        o = self._other_seconds(other)
+        return NotImplemented if o is None else self.total_seconds != o
 
     def pretty_time_str(self):
         s = self.seconds
@@ -0,0 +1,112 @@
+"""
+Times every stage of processing a synthetic course (see synthetic_course.py) and reports the peak memory.
+
+    python benchmarks/course_bench.py [--sizes 100 1000 10000 50000] [--assignments 20] [--score-matrix] [--tracemalloc] [--json results.json]
+
+The memory column is the process' peak resident memory after the stage. With --tracemalloc it is the peak
+python allocation during the stage instead (which makes every stage slower). Before python 3.9 the peak
+can't be reset, so the growth of the python allocations during the stage is reported.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_course import build_classroom, generate_course
+
+# dump_str recomputes the class wide sections for every student, so only a sample is rendered.
+DUMP_STR_SAMPLE = 20
+
+
+def run_stage(results: list, name: str, fn, use_tracemalloc: bool=False, count: int=None):
+    """Runs fn with its output hidden and appends its time and memory to results."""
+    if use_tracemalloc:
+        # reset_peak was added in python 3.9, before that the growth of the traced memory is reported.
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        memory_start = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        value = fn()
+    seconds = time.perf_counter() - start
+    if use_tracemalloc:
+        current, peak = tracemalloc.get_traced_memory()
+        memory = peak if hasattr(tracemalloc, "reset_peak") else current - memory_start
+    else:
+        # ru_maxrss is in kilobytes on linux.
+        memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    result = {"stage": name, "seconds": seconds, "memory": memory}
+    if count is not None:
+        result["per_item_seconds"] = seconds / max(1, count)
+    results.append(result)
+    return value
+
+
+def bench(students: int, assignments: int, use_score_matrix: bool=False, use_tracemalloc: bool=False, seed: int=0) -> list:
+    results = []
+    with tempfile.TemporaryDirectory() as dest:
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_course(dest, students=students, assignments=assignments, seed=seed)
+        if use_tracemalloc:
+            tracemalloc.start()
+        c = run_stage(results, "build", lambda: build_classroom(dest, use_score_matrix=use_score_matrix), use_tracemalloc)
+        stage = lambda name, fn, count=None: run_stage(results, name, fn, use_tracemalloc, count=count)
+        # The stages of Classroom.process.
+        stage("load_assignment_data", c.load_assignment_data)
+        stage("gen_active_students_scores", lambda: [cat.gen_active_students_scores(c) for cat in c.categories.values()])
+        stage("match_assignments_to_students", c.match_assignments_to_students)
+        stage("apply_extensions", c.apply_extensions)
+        stage("apply_slip_time", c.apply_slip_time)
+        stage("drop_lowest_assignments", c.drop_lowest_assignments)
+        if use_score_matrix:
+            stage("build_score_matrix", c.build_score_matrix)
+        stage("ranking", lambda: [c.get_student_ranking(s) for s in c.students], count=len(c.students))
+        stage("est_gpa", lambda: c.est_gpa(3.5, start_pts=0, max_pts=40))
+        with tempfile.TemporaryDirectory() as out:
+            stage("dump_student_results", lambda: c.dump_student_results(os.path.join(out, "results.csv"), include_assignment_scores=True))
+        sample = c.students[:DUMP_STR_SAMPLE]
+        stage("dump_str", lambda: [s.dump_str(c, class_dist=True, class_stats_all=True, class_stats_graded=True, include_rank=True) for s in sample], count=len(sample))
+        if use_tracemalloc:
+            tracemalloc.stop()
+    return results
+
+
+def format_bytes(n: float) -> str:
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if n < 1024 or unit == "GiB":
+            return f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def print_results(students: int, assignments: int, results: list):
+    print(f"{students} students x {assignments} assignments")
+    for r in results:
+        per_item = f"  ({r['per_item_seconds'] * 1000:.3f} ms each)" if "per_item_seconds" in r else ""
+        print(f"  {r['stage']:<32}{r['seconds']:>10.3f}s{format_bytes(r['memory']):>14}{per_item}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks processing synthetic courses.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000], help="the numbers of students")
+    parser.add_argument("--assignments", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--score-matrix", action="store_true", help="build and use the score matrix")
+    parser.add_argument("--tracemalloc", action="store_true", help="report the peak python allocations of each stage")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+    all_results = []
+    for students in args.sizes:
+        results = bench(students, args.assignments, use_score_matrix=args.score_matrix, use_tracemalloc=args.tracemalloc, seed=args.seed)
+        print_results(students, args.assignments, results)
+        all_results.append({"students": students, "assignments": args.assignments, "score_matrix": args.score_matrix, "stages": results})
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(all_results, f, indent=2)
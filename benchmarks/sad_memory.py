@@ -0,0 +1,71 @@
+"""
+Measures the memory used by StudentAssignmentData instances, against an unslotted baseline
+which copies the assignment's policy into every instance (the layout before AssignmentPolicy).
+
+    python benchmarks/sad_memory.py [count]
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from TotalCoursePoints import Category, Assignment, StudentAssignmentData
+from TotalCoursePoints.utils import Time
+
+
+class UnslottedStudentAssignmentData:
+    """The attributes StudentAssignmentData stored in its __dict__ before it used __slots__ and a shared policy."""
+    def __init__(self, score: float, time_late: Time, name: str, sid: str, email: str, assignment: Assignment, extension_time: Time=Time()):
+        self.time_late = time_late
+        self.score = 0 if not score else float(score)
+        self.assignment = assignment
+        self.name = name
+        self.sid = sid
+        self.email = email
+        self.slip_time_used = 0
+        self.extension_time = extension_time
+        self.data_loaded = True
+        self.data_found = True
+        self.dropped = False
+        self.hidden = None
+        self.late_interval = None
+        self.give_perfect_score = assignment.give_perfect_score
+        self.get_total_possible = assignment.get_total_possible
+        self.no_late_time = assignment.no_late_time
+        self.blanket_late_penalty = assignment.blanket_late_penalty
+        self.late_penalty = assignment.late_penalty
+        self.max_late_time = assignment.max_late_time
+        self.additional_points = assignment.additional_points
+        self.out_of = assignment.out_of
+        self.extra_credit = assignment.extra_credit
+        self.max_slip_count = assignment.category.max_slip_count
+        self.does_not_contribute = assignment.does_not_contribute
+        self.personal_comment = ""
+
+
+def measure(count: int, assignments_count: int=20, cls=StudentAssignmentData) -> float:
+    """Returns the number of bytes allocated per instance of cls."""
+    cat = Category("bench", course_points=100, out_of=10, late_interval=Time(days=1), late_penalty=0.1, max_slip_count=3)
+    assignments = [Assignment(f"a{i}", cat, course_points=5) for i in range(assignments_count)]
+    names = [(f"Student {i}", str(3000000 + i), f"s{i}@example.edu") for i in range(count // assignments_count)]
+    times = [Time(seconds=i * 60) for i in range(count // assignments_count)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    data = []
+    for a in assignments:
+        for (name, sid, email), time_late in zip(names, times):
+            data.append(cls(7.5, time_late, name, sid, email, a))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(data)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 120000
+    baseline = measure(count, cls=UnslottedStudentAssignmentData)
+    current = measure(count)
+    print(f"unslotted baseline: {baseline:.1f} bytes per instance ({count} instances)")
+    print(f"StudentAssignmentData: {current:.1f} bytes per instance ({100 * (1 - current / baseline):.0f}% less)")
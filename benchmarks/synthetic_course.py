@@ -0,0 +1,163 @@
+"""
+Generates a seeded synthetic course: a roster, Gradescope style assignment exports and the students' extensions.
+
+    python benchmarks/synthetic_course.py dest [students] [assignments] [seed]
+"""
+import csv
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from TotalCoursePoints import Assignment, Bin, Category, Classroom, GradeBins
+from TotalCoursePoints.utils import GracePeriod, Time
+
+COURSE_FILE = "course.json"
+ROSTER_FILE = "roster.csv"
+EXTENSIONS_FILE = "extensions.json"
+
+# name, course points, late penalty per day (None means no late time), drop lowest n assignments
+CATEGORIES = [
+    ("Homework", 200, 0.25, 1),
+    ("Labs", 50, 1, 2),
+    ("Projects", 250, 0.1, 0),
+    ("Exams", 300, None, 0),
+]
+
+GRADE_BINS = [
+    ("A+", 4.0, 0.97), ("A", 4.0, 0.93), ("A-", 3.7, 0.90),
+    ("B+", 3.3, 0.87), ("B", 3.0, 0.83), ("B-", 2.7, 0.80),
+    ("C+", 2.3, 0.77), ("C", 2.0, 0.73), ("C-", 1.7, 0.70),
+    ("D", 1.0, 0.60), ("F", 0.0, None),
+]
+
+def lateness_str(seconds: int) -> str:
+    return "{:02d}:{:02d}:{:02d}".format(seconds // 3600, (seconds // 60) % 60, seconds % 60)
+
+def generate_course(dest: str, students: int=1000, assignments: int=20, categories: int=4, seed: int=0,
+        out_of: float=10, late_rate: float=0.15, mean_late_days: float=1, missing_rate: float=0.05,
+        duplicate_rate: float=0.01, non_roster_rate: float=0.01, extension_rate: float=0.05,
+        inactive_rate: float=0.03, pnp_rate: float=0.1, incomplete_rate: float=0.005, max_slip_count: int=3) -> dict:
+    """
+    Writes the course to dest and returns its description (which is also written to dest/course.json).
+    Every rate is the probability of a student (or of a submission for the lateness, missing and duplicate rates).
+    The late submissions are late by an exponentially distributed amount of time, some of them within a 5 minute grace period.
+    Duplicate rows are resubmissions of a roster student and non roster rows are students who are not in the roster.
+    """
+    rnd = random.Random(seed)
+    os.makedirs(os.path.join(dest, "data"), exist_ok=True)
+    cats = [CATEGORIES[i % len(CATEGORIES)] for i in range(categories)]
+    course = {"seed": seed, "students": students, "max_slip_count": max_slip_count, "out_of": out_of, "categories": []}
+    for i, (name, points, late_penalty, drop) in enumerate(cats):
+        if i >= len(CATEGORIES):
+            name = f"{name}{i // len(CATEGORIES)}"
+        course["categories"].append({"name": name, "course_points": points, "late_penalty": late_penalty, "drop_lowest_n_assignments": drop, "assignments": []})
+    for j in range(assignments):
+        course["categories"][j % categories]["assignments"].append(f"a{j}")
+
+    sids = [str(3030000000 + i) for i in range(students)]
+    ability = [min(1, max(0, rnd.gauss(0.85, 0.1))) for _ in range(students)]
+    with open(os.path.join(dest, ROSTER_FILE), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Name", "Email", "SID", "InCanvas", "ForGrade", "Incomplete"])
+        for i, sid in enumerate(sids):
+            pnp = rnd.random() < pnp_rate
+            writer.writerow([
+                f"Student {i}", f"student{i}@example.edu", sid,
+                str(rnd.random() >= inactive_rate),
+                "EPN" if pnp else "GRD",
+                str(rnd.random() < incomplete_rate),
+            ])
+
+    header = ["Name", "SID", "Email", "Total Score", "Max Points", "Status", "Submission Time", "Lateness (H:M:S)"]
+    extensions = {}
+    for cat in course["categories"]:
+        os.makedirs(os.path.join(dest, "data", cat["name"]), exist_ok=True)
+        for aid in cat["assignments"]:
+            rows = []
+            def add_row(i, sid, score_ability):
+                if rnd.random() < missing_rate:
+                    rows.append([f"Student {i}", sid, f"student{i}@example.edu", "", out_of, "Missing", "", ""])
+                    return
+                score = round(2 * out_of * min(1, max(0, rnd.gauss(score_ability, 0.1)))) / 2
+                late = 0
+                if rnd.random() < late_rate:
+                    if rnd.random() < 0.2:
+                        late = rnd.randint(1, 300)
+                    else:
+                        late = int(rnd.expovariate(1 / (mean_late_days * 86400)))
+                rows.append([f"Student {i}", sid, f"student{i}@example.edu", score, out_of, "Graded", "2020-01-01 00:00:00 -0800", lateness_str(late)])
+            for i, sid in enumerate(sids):
+                add_row(i, sid, ability[i])
+                if rnd.random() < duplicate_rate:
+                    add_row(i, sid, ability[i])
+                if rnd.random() < extension_rate:
+                    extensions.setdefault(sid, {}).setdefault(cat["name"], {})[aid] = rnd.randint(1, 3)
+            for k in range(int(students * non_roster_rate)):
+                add_row(students + k, str(3040000000 + k), rnd.random())
+            rnd.shuffle(rows)
+            with open(os.path.join(dest, "data", cat["name"], f"{aid}.csv"), "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(rows)
+
+    with open(os.path.join(dest, EXTENSIONS_FILE), "w") as f:
+        json.dump(extensions, f)
+    with open(os.path.join(dest, COURSE_FILE), "w") as f:
+        json.dump(course, f)
+    return course
+
+def build_classroom(dest: str, use_score_matrix: bool=False) -> Classroom:
+    """Creates the classroom of a generated course and loads its roster and extensions (the assignments are not loaded)."""
+    with open(os.path.join(dest, COURSE_FILE)) as f:
+        course = json.load(f)
+    categories = {}
+    total_points = 0
+    for spec in course["categories"]:
+        late_penalty = spec["late_penalty"]
+        cat = Category(
+            spec["name"],
+            course_points=spec["course_points"],
+            late_penalty=1 if late_penalty is None else late_penalty,
+            late_interval=Time(days=1),
+            grace_period=GracePeriod(Time(minutes=5)),
+            no_late_time=late_penalty is None,
+            max_slip_count=None if late_penalty is None else course["max_slip_count"],
+            drop_lowest_n_assignments=spec["drop_lowest_n_assignments"],
+        )
+        points = spec["course_points"] / max(1, len(spec["assignments"]))
+        for aid in spec["assignments"]:
+            cat.add_assignment(Assignment(aid, cat, data_file=os.path.join(dest, "data", spec["name"], f"{aid}.csv"), course_points=points, out_of=course["out_of"]))
+        categories[cat.name] = cat
+        total_points += spec["course_points"]
+    bins = []
+    upper = None
+    for gid, gpa, ratio in GRADE_BINS:
+        lower = None if ratio is None else ratio * total_points
+        bins.append(Bin(gid, gpa, lower, upper))
+        upper = lower
+    grade_bins = GradeBins(bins, pass_threshold=0.7 * total_points, normal_max_points=total_points)
+    c = Classroom("Synthetic Course", "SYN 1", grade_bins, categories=categories, students=[], use_score_matrix=use_score_matrix)
+    c.load_students_from_roster(os.path.join(dest, ROSTER_FILE))
+    with open(os.path.join(dest, EXTENSIONS_FILE)) as f:
+        extensions = json.load(f)
+    for sid, cat_exts in extensions.items():
+        student = c.get_student(sid)
+        if student is None:
+            continue
+        student.extensionData = {cat: {aid: Time(days=days) for aid, days in exts.items()} for cat, exts in cat_exts.items()}
+    return c
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    dest = sys.argv[1]
+    students = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    assignments = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+    generate_course(dest, students=students, assignments=assignments, seed=seed)
+    print(f"Generated a course with {students} students and {assignments} assignments in {dest}")
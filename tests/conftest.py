@@ -0,0 +1,33 @@
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from synthetic_course import build_classroom, generate_course
+
+
+@pytest.fixture(scope="session")
+def course_dir(tmp_path_factory):
+    """A small synthetic course (see benchmarks/synthetic_course.py)."""
+    dest = str(tmp_path_factory.mktemp("course"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate_course(dest, students=200, assignments=12, seed=1)
+    return dest
+
+
+@pytest.fixture
+def make_classroom(course_dir):
+    """Returns a function which builds and processes a fresh classroom of the synthetic course."""
+    def make(use_score_matrix=False, process=True):
+        with contextlib.redirect_stdout(io.StringIO()):
+            c = build_classroom(course_dir, use_score_matrix=use_score_matrix)
+            if process:
+                c.process()
+        return c
+    return make
@@ -0,0 +1,86 @@
+"""
+A fake gspread backend for the GSheet tests: clients open spreadsheets held in memory and every request is recorded.
+"""
+import json
+import threading
+import time
+
+from gspread.exceptions import APIError
+
+
+class FakeResponse:
+    def __init__(self, status: str, code: int):
+        self.status_code = code
+        self.text = json.dumps({"error": {"code": code, "status": status, "message": status}})
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def resource_exhausted() -> APIError:
+    return APIError(FakeResponse("RESOURCE_EXHAUSTED", 429))
+
+
+class FakeSpreadsheet:
+    def __init__(self, backend, credentials: str, key: str):
+        self.backend = backend
+        self.credentials = credentials
+        self.key = key
+
+    def fetch_sheet_metadata(self):
+        self.backend.request(self.credentials, self.key, "fetch_sheet_metadata")
+        return {"sheets": [{"properties": {"title": title}} for title in self.backend.sheets[self.key]]}
+
+    def values_batch_get(self, ranges):
+        self.backend.request(self.credentials, self.key, "values_batch_get")
+        sheets = self.backend.sheets[self.key]
+        return {"valueRanges": [{"range": f"'{title}'!A1:Z", "values": sheets[title]} for title in ranges]}
+
+    def get_lastUpdateTime(self):
+        self.backend.request(self.credentials, self.key, "get_lastUpdateTime")
+        return self.backend.revisions.get(self.key, "2020-01-01T00:00:00.000Z")
+
+
+class FakeClient:
+    def __init__(self, backend, credentials: str):
+        self.backend = backend
+        self.credentials = credentials
+
+    def open_by_key(self, key: str) -> FakeSpreadsheet:
+        self.backend.request(self.credentials, key, "open_by_key")
+        return FakeSpreadsheet(self.backend, self.credentials, key)
+
+
+class FakeBackend:
+    """
+    sheets maps a spreadsheet key to its sheets' rows. Every request takes delay seconds and
+    failures[credentials] is the number of the next requests of that account which are rejected with a 429.
+    revisions maps a spreadsheet key to its last update time.
+    """
+    def __init__(self, sheets: dict, delay: float=0):
+        self.sheets = sheets
+        self.delay = delay
+        self.failures = {}
+        self.revisions = {}
+        self.requests = []
+        self.authorized = []
+        self.lock = threading.Lock()
+
+    def client_factory(self, credentials: str) -> FakeClient:
+        with self.lock:
+            self.authorized.append(credentials)
+        return FakeClient(self, credentials)
+
+    def request(self, credentials: str, key: str, name: str):
+        with self.lock:
+            self.requests.append((credentials, key, name))
+            failures = self.failures.get(credentials, 0)
+            if failures:
+                self.failures[credentials] = failures - 1
+        time.sleep(self.delay)
+        if failures:
+            raise resource_exhausted()
+
+    def count(self, name: str=None, credentials: str=None) -> int:
+        with self.lock:
+            return sum(1 for c, _, n in self.requests if (name is None or n == name) and (credentials is None or c == credentials))
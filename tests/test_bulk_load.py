@@ -0,0 +1,52 @@
+import contextlib
+import glob
+import io
+import os
+
+from TotalCoursePoints import Assignment, Category
+from TotalCoursePoints.utils import GracePeriod, Time
+
+EDGE_CSV = """Name,SID,Email,Total Score,Max Points,Status,Submission Time,Lateness (H:M:S)
+a,1,a@x,abc,10,Graded,,00:00:01
+b,2,b@x,,10,Missing,,
+c,1,c@x,-0,10,Graded,,01:00:00
+d,3,d@x, 4.5 ,10,Graded
+e,4,e@x,7,10,Graded,,00:10:00
+"""
+
+
+def load(data_file, bulk):
+    grace_period = GracePeriod(Time(minutes=5))
+    with contextlib.redirect_stdout(io.StringIO()):
+        cat = Category("c", course_points=10, grace_period=grace_period)
+        a = Assignment("a", cat, data_file=data_file, grace_period=grace_period)
+    a.load_file(bulk=bulk)
+    if bulk:
+        a.materialize_data()
+    return a
+
+
+def describe(data):
+    def row(sad):
+        if isinstance(sad, list):
+            return [row(s) for s in sad]
+        late = sad.time_late.get_seconds() if isinstance(sad.time_late, Time) else sad.time_late
+        return (repr(sad.score), late, sad.name, sad.sid, sad.email)
+    return {key: row(sad) for key, sad in data.items()}
+
+
+def data_files(course_dir, tmp_path):
+    edge = os.path.join(str(tmp_path), "edge.csv")
+    with open(edge, "w") as f:
+        f.write(EDGE_CSV)
+    return sorted(glob.glob(os.path.join(course_dir, "data", "*", "*.csv")))[:4] + [edge]
+
+
+def test_bulk_load_matches_row_load(course_dir, tmp_path):
+    for data_file in data_files(course_dir, tmp_path):
+        rows = load(data_file, bulk=False)
+        bulk = load(data_file, bulk=True)
+        assert repr(bulk.all_scores) == repr(rows.all_scores)
+        assert repr(bulk.scores) == repr(rows.scores)
+        assert describe(bulk.data) == describe(rows.data)
+        assert describe(bulk.edata) == describe(rows.edata)
@@ -0,0 +1,56 @@
+import glob
+import os
+import shutil
+
+from TotalCoursePoints import ParsedDataCache
+from TotalCoursePoints.cache import STAT_DIR
+
+
+def copy_data_file(course_dir, tmp_path):
+    src = sorted(glob.glob(os.path.join(course_dir, "data", "*", "*.csv")))[0]
+    dest = os.path.join(str(tmp_path), "a.csv")
+    shutil.copy(src, dest)
+    return dest
+
+
+def test_hits_only_hash_changed_files(course_dir, tmp_path, monkeypatch):
+    data_file = copy_data_file(course_dir, tmp_path)
+    cache = ParsedDataCache(os.path.join(str(tmp_path), "cache"))
+    first = cache.load(data_file)
+    assert (cache.hits, cache.misses) == (0, 1)
+    hashed = []
+    real_open = open
+    def tracking_open(path, *args, **kwargs):
+        if path == data_file:
+            hashed.append(path)
+        return real_open(path, *args, **kwargs)
+    with monkeypatch.context() as m:
+        m.setattr("builtins.open", tracking_open)
+        second = cache.load(data_file)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert hashed == []
+    assert second.sid.tolist() == first.sid.tolist()
+
+    # Touching the file hashes it again but its content is still cached.
+    st = os.stat(data_file)
+    os.utime(data_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    cache.load(data_file)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    with open(data_file, "a") as f:
+        f.write("New Student,1,new@example.edu,5,10,Graded,,00:00:00\n")
+    changed = cache.load(data_file)
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert len(changed) == len(first) + 1
+
+
+def test_eviction_keeps_the_new_entry(course_dir, tmp_path):
+    data_file = copy_data_file(course_dir, tmp_path)
+    cache = ParsedDataCache(os.path.join(str(tmp_path), "cache"), max_bytes=1)
+    cache.load(data_file)
+    assert len(cache.get_entries()) == 1
+    cache.load(data_file)
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.clear()
+    assert cache.get_entries() == []
+    assert not os.path.exists(os.path.join(str(tmp_path), "cache", STAT_DIR))
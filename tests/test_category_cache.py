@@ -0,0 +1,29 @@
+import contextlib
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+
+def test_concurrent_invalidations_get_distinct_versions(make_classroom):
+    c = make_classroom(process=False)
+    cat = next(iter(c.categories.values()))
+    def invalidate(_):
+        versions = []
+        for _ in range(1000):
+            cat.invalidate_cache()
+            versions.append(cat.version)
+        return versions
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        versions = [v for vs in executor.map(invalidate, range(4)) for v in vs]
+    assert len(set(versions)) == len(versions)
+
+
+def test_concurrent_load_refreshes_structure_cache(make_classroom):
+    c = make_classroom(process=False)
+    before = c.get_total_possible(only_inputted=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        c.load_assignment_data(workers=4)
+    serial = make_classroom(process=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        serial.load_assignment_data()
+    assert before == 0
+    assert c.get_total_possible(only_inputted=True) == serial.get_total_possible(only_inputted=True) > 0
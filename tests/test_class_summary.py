@@ -0,0 +1,82 @@
+import contextlib
+import io
+import os
+import shutil
+
+import pytest
+
+from synthetic_course import build_classroom
+from TotalCoursePoints import summary
+from TotalCoursePoints.summary import ClassSummary
+
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+@pytest.fixture
+def summary_file(make_classroom, tmp_path):
+    c = make_classroom()
+    dest = os.path.join(tmp_path, "summary.npz")
+    quiet(c.dump_class_summary, dest)
+    return dest
+
+
+def process_for_student(course_dir, summary_file, sid):
+    c = build_classroom(course_dir)
+    summary = c.load_class_summary(summary_file)
+    student = quiet(c.process_for_student, sid, summary)
+    return c, student
+
+
+def test_values_missing_from_the_summary_are_not_computed(course_dir, summary_file, make_classroom):
+    sid = make_classroom(process=False).students[0].sid
+    c, student = process_for_student(course_dir, summary_file, sid)
+    c.get_student_ranking(student)
+    with pytest.raises(ValueError, match="not in the class summary"):
+        c.get_student_ranking(student, with_hidden=True)
+    with pytest.raises(ValueError, match="not in the class summary"):
+        c.get_grade_bins_count(with_hidden=True)
+    with pytest.raises(ValueError, match="not in the class summary"):
+        c.get_class_points_stats_str(only_for_grade=False, skip_non_roster=False)
+
+
+def test_only_the_student_data_is_created(course_dir, summary_file, make_classroom):
+    sid = make_classroom(process=False).students[0].sid
+    c, student = process_for_student(course_dir, summary_file, sid)
+    for cat in c.categories.values():
+        for a in cat.assignments:
+            assert set(a.data) <= {sid}
+
+
+def test_student_results_match_the_full_process(course_dir, summary_file, make_classroom):
+    full = make_classroom()
+    options = dict(class_dist=True, class_stats_all=True, class_stats_graded=True, include_rank=True)
+    for student in full.students[::len(full.students) // 15][:15]:
+        c, single = process_for_student(course_dir, summary_file, student.sid)
+        c.set_time(full.time)
+        assert quiet(single.dump_str, c, **options) == quiet(student.dump_str, full, **options)
+
+
+def test_stale_summary_is_rejected(course_dir, tmp_path):
+    course = os.path.join(tmp_path, "course")
+    shutil.copytree(course_dir, course)
+    c = build_classroom(course)
+    quiet(c.process)
+    dest = os.path.join(tmp_path, "summary.npz")
+    quiet(c.dump_class_summary, dest)
+    c = build_classroom(course)
+    c.load_class_summary(dest)
+    data_file = next(iter(c.categories.values())).assignments[0].data_file
+    with open(data_file, "a") as f:
+        f.write("Student 145,3030000145,student145@example.edu,0.0,10,Graded,2020-01-01 00:00:00 -0800,00:00:00\n")
+    with pytest.raises(ValueError, match="stale"):
+        c.load_class_summary(dest)
+    c.load_class_summary(dest, check_fresh=False)
+
+
+def test_summary_version_mismatch_is_rejected(summary_file, monkeypatch):
+    monkeypatch.setattr(summary, "SUMMARY_FORMAT_VERSION", summary.SUMMARY_FORMAT_VERSION + 1)
+    with pytest.raises(ValueError, match="version"):
+        ClassSummary.load(summary_file)
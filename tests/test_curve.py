@@ -0,0 +1,35 @@
+import pytest
+
+from TotalCoursePoints import Bin, GradeBins
+from TotalCoursePoints.curve import CurveSearch
+from TotalCoursePoints.grade_bins import Max
+
+# The synthetic course is worth 800 points.
+BINS = [("A", 4.0, 600, None), ("B", 3.0, 500, 600), ("C", 2.0, 400, 500), ("D", 1.0, Max(), 400), ("F", 0.0, None, 400)]
+
+
+def make_grade_bins(pass_threshold):
+    bins = GradeBins([], pass_threshold=pass_threshold, normal_max_points=800)
+    for gid, gpa, low, high in BINS:
+        bins.add_bin(Bin(gid, gpa, low, high))
+    return bins
+
+
+@pytest.mark.parametrize("pass_threshold", [450, None, Bin("P", 0, None, None)])
+@pytest.mark.parametrize("use_score_matrix", [False, True])
+def test_curve_search_matches_grade_bins_count(make_classroom, pass_threshold, use_score_matrix):
+    c = make_classroom(use_score_matrix=use_score_matrix)
+    c.grade_bins = make_grade_bins(pass_threshold)
+    c.invalidate_cache()
+    curve = CurveSearch(c)
+    for offset in [0, 40, 120]:
+        c.set_raw_additional_pts(offset)
+        assert curve.get_grade_bins_counts([offset])[0] == c.get_grade_bins_count()
+
+
+def test_pass_thresholds_are_shared():
+    bins = make_grade_bins(Bin("P", 0, None, None))
+    assert bins.get_pass_threshold() == float("-inf")
+    assert bins.is_passing(-1)
+    assert bins.is_passing_many([-1]).tolist() == [True]
+    assert not make_grade_bins(None).is_passing(10 ** 9)
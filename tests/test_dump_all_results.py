@@ -0,0 +1,44 @@
+import contextlib
+import io
+import json
+import os
+
+OPTIONS = dict(class_dist=True, class_stats_all=True, class_stats_graded=True, include_rank=True)
+
+
+def quiet(fn, *args, **kwargs):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        fn(*args, **kwargs)
+    return out.getvalue()
+
+
+def expected_results(c, students):
+    # dump_str recomputes the class wide sections, so only a sample is rendered.
+    return {s.sid: json.loads(json.dumps(s.dump_str(c, **OPTIONS))) for s in students[::20]}
+
+
+def test_json_files_match_dump_str(make_classroom, tmp_path):
+    c = make_classroom()
+    dest = os.path.join(tmp_path, "results")
+    output = quiet(c.dump_all_results, dest, skip_non_roster=True, **OPTIONS)
+    active = [s for s in c.students if s.active_student]
+    assert len(active) < len(c.students)
+    assert sorted(os.listdir(dest)) == sorted(f"{s.sid}.json" for s in active)
+    assert f"Finished dumping results for {len(active)} students!" in output
+    for sid, expected in expected_results(c, active).items():
+        with open(os.path.join(dest, f"{sid}.json")) as f:
+            assert json.load(f) == expected
+
+
+def test_jsonl_lines_match_dump_str(make_classroom, tmp_path):
+    c = make_classroom()
+    dest = os.path.join(tmp_path, "results.jsonl")
+    output = quiet(c.dump_all_results, dest, jsonl=True, **OPTIONS)
+    with open(dest) as f:
+        lines = [json.loads(line) for line in f]
+    assert [line["sid"] for line in lines] == [s.sid for s in c.students]
+    assert f"Finished dumping results for {len(c.students)} students!" in output
+    results = {line["sid"]: line["results"] for line in lines}
+    for sid, expected in expected_results(c, c.students).items():
+        assert results[sid] == expected
@@ -0,0 +1,29 @@
+import contextlib
+import io
+import os
+
+import pytest
+
+
+def dump(c, filename):
+    with contextlib.redirect_stdout(io.StringIO()):
+        c.dump_student_results(filename, include_assignment_scores=True)
+    with open(filename) as f:
+        return f.read()
+
+
+def test_score_matrix_results_match_objects(make_classroom, tmp_path):
+    expected = dump(make_classroom(use_score_matrix=False), os.path.join(tmp_path, "objects.csv"))
+    actual = dump(make_classroom(use_score_matrix=True), os.path.join(tmp_path, "matrix.csv"))
+    assert actual == expected
+
+
+def test_missing_assignment_data_raises(make_classroom, tmp_path):
+    from TotalCoursePoints import Assignment, Category
+    c = make_classroom()
+    with contextlib.redirect_stdout(io.StringIO()):
+        cat = Category("Added", course_points=10)
+        cat.add_assignment(Assignment("extra", cat, course_points=10))
+    c.add_category(cat)
+    with pytest.raises(ValueError, match="Added/extra"):
+        dump(c, os.path.join(tmp_path, "results.csv"))
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from TotalCoursePoints import Bin, GradeBins
+from TotalCoursePoints.grade_bins import Max
+
+# Leaves [50, 60) and [75, 80) outside every bin, "O" overlaps A and B and "X" can never be reached.
+BINS = [
+    ("A+", 4.0, 97, Max()),
+    ("A", 4.0, 90, 97),
+    ("B", 3.0, 80, 90),
+    ("O", 3.5, 85, 95),
+    ("X", 0.0, Max(), None),
+    ("C", 2.0, 60, 75),
+    ("F", 0.0, None, 50),
+]
+SCORES = [-np.inf, -10, 0, 49.999, 50, 55, 59.999, 60, 74.999, 75, 77, 79.999, 80, 85, 89.999, 90, 96.999, 97, 100, 1e9, np.inf]
+
+
+def make_grade_bins(bins=BINS):
+    grade_bins = GradeBins([], normal_max_points=100)
+    for gid, gpa, low, high in bins:
+        grade_bins.add_bin(Bin(gid, gpa, low, high))
+    return grade_bins
+
+
+def reference_bin_id(grade_bins, value):
+    """The bin of the value found by checking every bin in order."""
+    for b in grade_bins.get_bins():
+        if value in b:
+            return b.id
+    return None
+
+
+def get_id(b):
+    return None if b is None else b.id
+
+
+def check_matches_reference(grade_bins, scores=SCORES):
+    expected = [reference_bin_id(grade_bins, v) for v in scores]
+    assert [get_id(grade_bins.in_bin(v)) for v in scores] == expected
+    assert grade_bins.in_bin_many(scores).tolist() == expected
+    return expected
+
+
+def test_in_bin_many_matches_in_bin():
+    expected = check_matches_reference(make_grade_bins())
+    assert expected[SCORES.index(55)] is None
+    assert expected[SCORES.index(77)] is None
+    assert expected[SCORES.index(1e9)] == "A+"
+    assert "X" not in expected
+
+
+def test_bin_without_bounds_contains_every_score():
+    grade_bins = make_grade_bins(BINS + [("P", 1.0, None, None)])
+    assert set(check_matches_reference(grade_bins)) == {"A+", "A", "B", "C", "F", "P"}
+
+
+@pytest.mark.parametrize("max_score", [100, 250, 0])
+def test_relative_bin_many_matches_relative_bin(max_score):
+    grade_bins = make_grade_bins()
+    scores = [0, 40, 55, 77, 80, 150, 240, 250]
+    expected = [get_id(grade_bins.relative_bin(s, max_score)) for s in scores]
+    assert grade_bins.relative_bin_many(scores, max_score).tolist() == expected
+
+
+def test_compiled_bins_are_invalidated():
+    grade_bins = make_grade_bins()
+    grade_bins.in_bin_many(SCORES)
+    grade_bins.add_bin(Bin("D", 1.0, 50, 60))
+    assert check_matches_reference(grade_bins)[SCORES.index(55)] == "D"
+    grade_bins.remove_bin("C")
+    assert check_matches_reference(grade_bins)[SCORES.index(60)] is None
+    grade_bins.increment_A_plus(2)
+    assert check_matches_reference(grade_bins, SCORES + [98, 99])[-2:] == ["A", "A+"]
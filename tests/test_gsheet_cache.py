@@ -0,0 +1,117 @@
+import contextlib
+import io
+import threading
+
+import pytest
+
+from TotalCoursePoints import cache
+from TotalCoursePoints.cache import GSheetCache
+from TotalCoursePoints.utils import GSheetClientPool, GSheetCredentialsManager
+
+from fake_gspread import FakeBackend
+
+SHEETS = {"key": {"Sheet1": [["sid", "days"], ["1", "2"]]}}
+RECORDS = {"Sheet1": [{"sid": "1", "days": "2"}]}
+
+
+@pytest.fixture
+def backend():
+    return FakeBackend(dict(SHEETS))
+
+
+@pytest.fixture
+def manager(backend):
+    pool = GSheetClientPool(client_factory=backend.client_factory)
+    return GSheetCredentialsManager(["c1.json"], client_pool=pool)
+
+
+def load(sheet_cache, manager):
+    fetch = lambda: manager.client_pool.fetch_all_sheets("key", manager)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return sheet_cache.load("key", manager, fetch)
+
+
+def get_counts(sheet_cache):
+    return (sheet_cache.hits, sheet_cache.revalidations, sheet_cache.misses)
+
+
+def test_miss_fetches_and_stores_the_sheets(tmp_path, backend, manager):
+    sheet_cache = GSheetCache(str(tmp_path))
+    assert load(sheet_cache, manager) == RECORDS
+    assert get_counts(sheet_cache) == (0, 0, 1)
+    assert backend.count("values_batch_get") == 1
+    assert sheet_cache.read_entry("key")["sheets"] == RECORDS
+
+
+def test_entry_within_the_ttl_is_used_without_requests(tmp_path, backend, manager):
+    sheet_cache = GSheetCache(str(tmp_path), ttl=60)
+    load(sheet_cache, manager)
+    requests = backend.count()
+    assert load(sheet_cache, manager) == RECORDS
+    assert get_counts(sheet_cache) == (1, 0, 1)
+    assert backend.count() == requests
+
+
+def test_expired_entry_is_revalidated_by_its_revision(tmp_path, backend, manager, monkeypatch):
+    sheet_cache = GSheetCache(str(tmp_path), ttl=60)
+    load(sheet_cache, manager)
+    now = cache.time.time()
+    monkeypatch.setattr(cache.time, "time", lambda: now + 120)
+    assert load(sheet_cache, manager) == RECORDS
+    assert get_counts(sheet_cache) == (0, 1, 1)
+    assert backend.count("values_batch_get") == 1
+    # Revalidating renews the entry, so it is within the ttl again.
+    load(sheet_cache, manager)
+    assert get_counts(sheet_cache) == (1, 1, 1)
+
+
+def test_changed_revision_fetches_again(tmp_path, backend, manager):
+    sheet_cache = GSheetCache(str(tmp_path))
+    load(sheet_cache, manager)
+    load(sheet_cache, manager)
+    assert get_counts(sheet_cache) == (0, 1, 1)
+    backend.revisions["key"] = "2020-01-02T00:00:00.000Z"
+    backend.sheets["key"] = {"Sheet1": [["sid", "days"], ["1", "3"]]}
+    assert load(sheet_cache, manager) == {"Sheet1": [{"sid": "1", "days": "3"}]}
+    assert get_counts(sheet_cache) == (0, 1, 2)
+    assert sheet_cache.read_entry("key")["revision"] == "2020-01-02T00:00:00.000Z"
+
+
+def test_without_revision_checks_every_load_fetches(tmp_path, backend, manager):
+    sheet_cache = GSheetCache(str(tmp_path), check_revision=False)
+    load(sheet_cache, manager)
+    load(sheet_cache, manager)
+    assert get_counts(sheet_cache) == (0, 0, 2)
+    assert backend.count("get_lastUpdateTime") == 0
+
+
+def test_offline_replays_the_cache(tmp_path, backend, manager):
+    load(GSheetCache(str(tmp_path)), manager)
+    requests = backend.count()
+    sheet_cache = GSheetCache(str(tmp_path), offline=True)
+    assert load(sheet_cache, manager) == RECORDS
+    assert get_counts(sheet_cache) == (1, 0, 0)
+    assert backend.count() == requests
+
+
+def test_offline_raises_on_a_missing_entry(tmp_path, backend, manager):
+    sheet_cache = GSheetCache(str(tmp_path), offline=True)
+    with pytest.raises(ValueError, match="not in the cache"):
+        load(sheet_cache, manager)
+    assert backend.count() == 0
+
+
+def test_counters_are_exact_under_concurrent_loads(tmp_path, manager):
+    sheet_cache = GSheetCache(str(tmp_path), ttl=60)
+    load(sheet_cache, manager)
+    barrier = threading.Barrier(8)
+    def run():
+        barrier.wait()
+        for _ in range(50):
+            load(sheet_cache, manager)
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert get_counts(sheet_cache) == (400, 0, 1)
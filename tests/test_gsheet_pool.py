@@ -0,0 +1,43 @@
+import threading
+
+from TotalCoursePoints.utils import GSheetClientPool, GSheetCredentialsManager
+
+from fake_gspread import FakeBackend
+
+SHEETS = {"key": {"Sheet1": [["sid", "days"], ["1", "2"]]}}
+
+
+def run_concurrently(fn, count: int):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+    def run(i):
+        barrier.wait()
+        results[i] = fn()
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_opens_of_a_key_make_one_request():
+    backend = FakeBackend(SHEETS, delay=0.05)
+    pool = GSheetClientPool(client_factory=backend.client_factory)
+    spreadsheets = run_concurrently(lambda: pool.open_by_key("c1.json", "key"), 8)
+    assert backend.count("open_by_key") == 1
+    assert all(s is spreadsheets[0] for s in spreadsheets)
+    assert backend.authorized == ["c1.json"]
+
+
+def test_clients_and_spreadsheets_are_reused_across_managers():
+    backend = FakeBackend(SHEETS)
+    pool = GSheetClientPool(client_factory=backend.client_factory)
+    first = GSheetCredentialsManager(["c1.json"], client_pool=pool)
+    second = GSheetCredentialsManager(["c1.json"], client_pool=pool)
+    assert pool.get_manager(["c1.json"]) is pool.get_manager(["c1.json"])
+    for manager in [first, second, first]:
+        assert manager.fetch_all_sheets("key") == {"Sheet1": [{"sid": "1", "days": "2"}]}
+    assert backend.authorized == ["c1.json"]
+    assert backend.count("open_by_key") == 1
+    assert backend.count("values_batch_get") == 3
@@ -0,0 +1,98 @@
+import contextlib
+import io
+import threading
+
+from TotalCoursePoints import utils
+from TotalCoursePoints.utils import Clock, GSheetClientPool, GSheetCredentialsManager
+
+from fake_gspread import FakeBackend
+
+SHEETS = {"key": {"Sheet1": [["sid", "days"], ["1", "2"]]}}
+
+
+class FakeClock(Clock):
+    """A clock whose sleep advances its time instead of waiting."""
+    def __init__(self):
+        self.time = 0.0
+        self.sleeps = []
+
+    def now(self) -> float:
+        return self.time
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.time += seconds
+
+
+def make_manager(backend, credentials_list, requests_per_minute=60):
+    clock = FakeClock()
+    pool = GSheetClientPool(client_factory=backend.client_factory, requests_per_minute=requests_per_minute, clock=clock)
+    return GSheetCredentialsManager(credentials_list, client_pool=pool), clock
+
+
+def test_resource_exhausted_rotates_to_the_next_account():
+    backend = FakeBackend(SHEETS)
+    manager, clock = make_manager(backend, ["c1.json", "c2.json"])
+    backend.failures["c1.json"] = 1
+    with contextlib.redirect_stdout(io.StringIO()):
+        meta = manager.safe_gspread_call("key", "fetch_sheet_metadata")
+    assert meta["sheets"][0]["properties"]["title"] == "Sheet1"
+    assert backend.count(credentials="c1.json") == 1
+    assert backend.count("fetch_sheet_metadata", credentials="c2.json") == 1
+    counters = manager.get_counters()
+    assert (counters["retries"], counters["backoffs"]) == (1, 0)
+    assert clock.sleeps == []
+
+
+def test_backoff_grows_exponentially_up_to_the_max(monkeypatch):
+    monkeypatch.setattr(utils, "gspread_max_backoff", 4)
+    # Removes the jitter so every backoff is its full delay.
+    monkeypatch.setattr(utils.random, "uniform", lambda low, high: high)
+    backend = FakeBackend(SHEETS)
+    manager, clock = make_manager(backend, ["c1.json", "c2.json"])
+    backend.failures = {"c1.json": 10 ** 6, "c2.json": 10 ** 6}
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert manager.safe_gspread_call("key", "fetch_sheet_metadata", attempts=6) is None
+    counters = manager.get_counters()
+    # The 6th exhaustion gives up instead of backing off.
+    assert counters["backoffs"] == 5
+    assert counters["backoff_time"] == 1 + 2 + 4 + 4 + 4
+    assert counters["retries"] == 12
+    assert clock.time >= counters["backoff_time"]
+
+
+def test_requests_wait_for_the_budget_of_every_account():
+    backend = FakeBackend(SHEETS)
+    manager, clock = make_manager(backend, ["c1.json", "c2.json"], requests_per_minute=60)
+    for _ in range(140):
+        manager.safe_gspread_call("key", "fetch_sheet_metadata")
+    # 120 requests use the initial budgets, the others wait for a token refilled at one per second per account.
+    assert abs(backend.count("fetch_sheet_metadata", "c1.json") - backend.count("fetch_sheet_metadata", "c2.json")) <= 1
+    assert 9 <= clock.time <= 11
+    assert manager.get_counters()["waits"] > 0
+
+
+def test_concurrent_fetches_of_a_spreadsheet_are_deduplicated():
+    backend = FakeBackend(SHEETS, delay=0.05)
+    manager, _ = make_manager(backend, ["c1.json", "c2.json"])
+    barrier = threading.Barrier(8)
+    results = []
+    def fetch():
+        barrier.wait()
+        results.append(manager.client_pool.fetch_all_sheets("key", manager))
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert backend.count("fetch_sheet_metadata") == 1
+    assert backend.count("values_batch_get") == 1
+    assert results == [{"Sheet1": [{"sid": "1", "days": "2"}]}] * 8
+
+
+def test_classroom_sets_the_attempts(monkeypatch):
+    from TotalCoursePoints import Classroom, GradeBins
+    monkeypatch.setattr(utils, "gspread_attempts", utils.gspread_attempts)
+    with contextlib.redirect_stdout(io.StringIO()):
+        Classroom("Course", "C 1", GradeBins(), categories={}, students=[], gspread_attempts=3)
+    assert utils.gspread_attempts == 3
@@ -0,0 +1,24 @@
+import tracemalloc
+
+from TotalCoursePoints.instrumentation import Instrumentation
+
+
+def record_span():
+    with Instrumentation(trace_memory=True) as inst:
+        with inst.span("allocate"):
+            data = [bytes(1000) for _ in range(100)]
+    del data
+    return inst.spans[0]
+
+
+def test_span_records_the_peak_memory():
+    span = record_span()
+    assert span["peak_memory"] >= 100 * 1000
+
+
+def test_span_records_the_memory_growth_without_reset_peak(monkeypatch):
+    # Python < 3.9 has no tracemalloc.reset_peak.
+    monkeypatch.delattr(tracemalloc, "reset_peak")
+    span = record_span()
+    assert "peak_memory" not in span
+    assert span["memory_delta"] >= 100 * 1000
@@ -0,0 +1,65 @@
+import contextlib
+import csv
+import io
+import os
+import shutil
+
+import numpy as np
+
+from synthetic_course import build_classroom
+
+
+def process(course_dir):
+    with contextlib.redirect_stdout(io.StringIO()):
+        c = build_classroom(course_dir)
+        c.process()
+    return c
+
+
+def results(c, filename):
+    with contextlib.redirect_stdout(io.StringIO()):
+        c.dump_student_results(filename, include_assignment_scores=True)
+    with open(filename) as f:
+        return f.read()
+
+
+def totals(c):
+    return np.array([s.total_points(c=c, with_hidden=True) for s in c.students])
+
+
+def change_data_file(data_file):
+    """Lowers some scores and makes some submissions late so the slip time and dropping change."""
+    with open(data_file) as f:
+        rows = list(csv.DictReader(f))
+    for i, row in enumerate(rows):
+        if i % 3 == 0:
+            row["Total Score"] = "0.0"
+        elif i % 3 == 1:
+            row["Lateness (H:M:S)"] = "30:00:00"
+    with open(data_file, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_refresh_matches_a_full_process(course_dir, tmp_path):
+    course = os.path.join(tmp_path, "course")
+    shutil.copytree(course_dir, course)
+    c = process(course)
+    for cat in c.categories.values():
+        if cat.max_slip_count is not None and cat.drop_lowest_n_assignments:
+            break
+    assignment = cat.assignments[1]
+    before = totals(c)
+    change_data_file(assignment.data_file)
+    with contextlib.redirect_stdout(io.StringIO()):
+        c.refresh_assignment(assignment)
+    fresh = process(course)
+    assert not np.array_equal(totals(c), before)
+    assert np.array_equal(totals(c), totals(fresh))
+    assert results(c, os.path.join(tmp_path, "refreshed.csv")) == results(fresh, os.path.join(tmp_path, "fresh.csv"))
+    options = dict(class_dist=True, class_stats_all=True, class_stats_graded=True, include_rank=True)
+    c.set_time(fresh.time)
+    # dump_str recomputes the class wide sections, so only a sample is compared.
+    for student, fresh_student in list(zip(c.students, fresh.students))[::20]:
+        assert student.dump_str(c, **options) == fresh_student.dump_str(fresh, **options)
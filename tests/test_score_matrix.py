@@ -0,0 +1,39 @@
+import contextlib
+import io
+
+import numpy as np
+
+
+def object_totals(c):
+    return np.array([s.total_points(c=c, with_hidden=True) for s in c.students])
+
+
+def test_matrix_matches_objects(make_classroom):
+    c = make_classroom(use_score_matrix=True)
+    assert np.array_equal(c.score_matrix.get_totals(with_hidden=True), object_totals(c))
+
+
+def test_matrix_is_rebuilt_after_invalidation(make_classroom):
+    c = make_classroom(use_score_matrix=True)
+    sm = c.score_matrix
+    cat = next(iter(c.categories.values()))
+    sad = c.students[0].get_category_data(cat).assignments_data[0]
+    sad.score = 0
+    c.invalidate_cache()
+    assert c.score_matrix is not sm
+    assert np.array_equal(c.score_matrix.get_totals(with_hidden=True), object_totals(c))
+
+
+def test_matrix_is_rebuilt_after_refresh_assignment(make_classroom):
+    c = make_classroom(use_score_matrix=True)
+    sm = c.score_matrix
+    assignment = next(iter(c.categories.values())).assignments[0]
+    with contextlib.redirect_stdout(io.StringIO()):
+        c.refresh_assignment(assignment)
+    assert c.score_matrix is not sm
+    assert np.array_equal(c.score_matrix.get_totals(with_hidden=True), object_totals(c))
+
+
+def test_matrix_is_not_built_before_processing(make_classroom):
+    c = make_classroom(use_score_matrix=True, process=False)
+    assert c.score_matrix is None
@@ -0,0 +1,29 @@
+import contextlib
+import io
+import os
+
+import numpy as np
+
+from synthetic_course import build_classroom
+
+
+def process(course_dir, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        c = build_classroom(course_dir)
+        c.process(**kwargs)
+    return c
+
+
+def dump(c, filename):
+    with contextlib.redirect_stdout(io.StringIO()):
+        c.dump_student_results(filename, include_assignment_scores=True)
+    with open(filename) as f:
+        return f.read()
+
+
+def test_sharded_processing_matches_serial(course_dir, tmp_path):
+    serial = process(course_dir)
+    sharded = process(course_dir, shard_workers=2, shard_size=16)
+    totals = lambda c: np.array([s.total_points(c=c, with_hidden=True) for s in c.students])
+    assert np.array_equal(totals(sharded), totals(serial))
+    assert dump(sharded, os.path.join(tmp_path, "sharded.csv")) == dump(serial, os.path.join(tmp_path, "serial.csv"))
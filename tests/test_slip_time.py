@@ -0,0 +1,52 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from TotalCoursePoints import Assignment, Category
+from TotalCoursePoints.assignment import StudentAssignmentData
+from TotalCoursePoints.category import StudentCategoryData
+from TotalCoursePoints.utils import Time
+
+
+def random_category_data(rnd):
+    """Returns two identical StudentCategoryData with random late assignments."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        cat = Category(
+            "Labs",
+            course_points=rnd.choice([10, 50, 100]),
+            late_penalty=rnd.choice([0.1, 0.2, 0.25, 1 / 3, 0.5]),
+            max_slip_count=rnd.randint(0, 8),
+            blanket_late_penalty=rnd.random() < 0.1,
+        )
+        for i in range(rnd.randint(1, 7)):
+            cat.add_assignment(Assignment(
+                f"lab{i}", cat,
+                course_points=rnd.choice([1, 2.5, 10 / 3, 7]),
+                out_of=rnd.choice([7, 10, 21]),
+                allowed_slip_count=rnd.choice([None, None, 1, 2]),
+            ))
+    rows = []
+    for a in cat.assignments:
+        late_days = rnd.choice([0, 0, 1, 2, 3, 4])
+        rows.append((a, rnd.choice([0, 3.5, 7, 10]), Time(days=late_days, hours=rnd.randint(0, 3))))
+    def make():
+        sads = [StudentAssignmentData(score, late, "s", "1", "s@x", a) for a, score, late in rows]
+        return StudentCategoryData(cat, sads)
+    return make(), make()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_optimal_matches_brute_force(seed):
+    rnd = random.Random(seed)
+    for _ in range(150):
+        optimal, brute = random_category_data(rnd)
+        optimal.apply_optimal_slip_time()
+        brute.apply_brute_force_slip_time()
+        assert [sad.slip_time_used for sad in optimal.assignments_data] == [sad.slip_time_used for sad in brute.assignments_data]
+        assert optimal.get_total_score(with_hidden=True) == brute.get_total_score(with_hidden=True)
+
+
+def test_slip_time_defaults_to_optimal():
+    assert StudentCategoryData.apply_slip_time is StudentCategoryData.apply_optimal_slip_time